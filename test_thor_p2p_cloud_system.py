@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Tests for THOR P2P private file sharing integrity
+"""
+
+import asyncio
+import base64
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cryptography.exceptions import InvalidTag
+
+from thor_p2p_cloud_system import THORCrypto, THORFileSharing
+
+class PrivateFileIntegrityTest(unittest.TestCase):
+    """Private files must authenticate before any plaintext is produced"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.work_dir = Path(self._tmp.name)
+        crypto = THORCrypto()
+        crypto.node_id = 'test-node'
+        self.sharing = THORFileSharing(crypto, str(self.work_dir / 'storage'))
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _share(self, data: bytes):
+        source = self.work_dir / 'source.bin'
+        source.write_bytes(data)
+        return asyncio.run(self.sharing.share_file(str(source), 'private'))
+
+    def _tamper(self, file_share):
+        stored = self.sharing.storage_dir / f"{file_share.file_id}.enc"
+        raw = bytearray(stored.read_bytes())
+        raw[len(raw) // 2] ^= 0x01
+        stored.write_bytes(bytes(raw))
+        return stored
+
+    def test_round_trip(self):
+        for data in (b'THOR compressible payload ' * 50000, os.urandom(3 * (1 << 20) + 123)):
+            file_share = self._share(data)
+            output_path = asyncio.run(self.sharing.download_file(file_share, str(self.work_dir / 'out.bin')))
+            self.assertEqual(Path(output_path).read_bytes(), data)
+
+    def test_tampered_file_raises_invalid_tag(self):
+        file_share = self._share(b'THOR compressible payload ' * 50000)
+        self.assertEqual(file_share.compression, 'zlib')
+        stored = self._tamper(file_share)
+
+        output = io.BytesIO()
+        with open(stored, 'rb') as encrypted:
+            with self.assertRaises(InvalidTag):
+                self.sharing._decrypt_stream(
+                    encrypted, output,
+                    base64.b64decode(file_share.encryption_key),
+                    file_share.compression
+                )
+        self.assertEqual(output.getvalue(), b'')
+
+    def test_tampered_download_leaves_no_output(self):
+        file_share = self._share(b'THOR compressible payload ' * 50000)
+        self._tamper(file_share)
+
+        output_path = self.work_dir / 'out.bin'
+        self.assertIsNone(asyncio.run(self.sharing.download_file(file_share, str(output_path))))
+        self.assertFalse(output_path.exists())
+
+if __name__ == '__main__':
+    unittest.main()
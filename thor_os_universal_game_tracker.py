@@ -38,6 +38,20 @@ import subprocess
 from collections import defaultdict, deque
 import platform
 import re
+import struct
+import heapq
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 # Game Tracking Configuration
 GAME_TRACKER_VERSION = "1.0.0"
@@ -45,6 +59,10 @@ GAME_TRACKER_DATA_PATH = Path.home() / ".thor-os" / "game_tracking"
 GAME_TRACKER_DB_PATH = GAME_TRACKER_DATA_PATH / "game_sessions.db"
 GAME_TRACKER_ACHIEVEMENTS_DB = GAME_TRACKER_DATA_PATH / "achievements.db"
 
+# Achievements are partitioned into one database per platform (ach/{platform}.db)
+ACHIEVEMENT_PLATFORMS = ('steam', 'epic', 'gog', 'xbox', 'standalone', 'unknown')
+ACHIEVEMENTS_SCHEMA = "ach"  # schema name when attached to the sessions database
+
 # Platform APIs (configured with proper authentication in production)
 STEAM_API_BASE = "https://api.steampowered.com"
 EPIC_API_BASE = "https://api.epicgames.dev"
@@ -55,15 +73,109 @@ XBOX_API_BASE = "https://xboxapi.com"
 AUTO_ANONYMIZE_SESSIONS = True
 REQUIRE_TRACKING_CONSENT = True
 SHARE_ACHIEVEMENTS_PUBLICLY = False
+TRACKING_CONSENT_ENV = "THOR_TRACKING_CONSENT"  # "1" grants consent when running headless
 LOCAL_ONLY_MODE = False
 
+# Common game install directories (matched case-insensitively against exe paths)
+GAME_DIRECTORY_KEYWORDS = (
+    'steam', 'games', 'epic games', 'gog galaxy', 'origin',
+    'uplay', 'battle.net', 'minecraft'
+)
+
+# Notifications
+NOTIFICATION_RING_SIZE = 256
+
 # Tracking Intervals
 GAME_DETECTION_INTERVAL = 5.0  # seconds
 SESSION_SAVE_INTERVAL = 60.0   # seconds
 ACHIEVEMENT_CHECK_INTERVAL = 300.0  # 5 minutes
+DB_MAINTENANCE_INTERVAL = 3600.0  # 1 hour
+
+PLAYTIME_STATS_CACHE_TTL = 30.0  # seconds
+
+# Performance Sampling
+PERF_SAMPLE_STRUCT = struct.Struct("<4H")  # fps*10, cpu*10, gpu*10, memory MB
+PERF_SAMPLE_MAX = 0xFFFF
+PERF_SAMPLE_FLUSH_INTERVAL = 10.0  # seconds between batched sample writes
+PERF_SAMPLE_FLUSH_BATCH = 500  # pending samples that force an early flush
+
+# SQLite Tuning
+SQLITE_CACHE_SIZE_KB = 64000
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+SQLITE_WAL_AUTOCHECKPOINT = 1000  # pages
+SQLITE_JOURNAL_SIZE_LIMIT = 64 * 1024 * 1024
+SQLITE_VACUUM_PAGES = 10000  # pages released per maintenance pass
 
 logger = logging.getLogger(__name__)
 
+def _configure_db(path: Path):
+    """Apply persistent database settings once per database file"""
+    conn = sqlite3.connect(path)
+    # auto_vacuum only takes effect on an existing database after a full VACUUM
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+
+def _connect_db(path: Path) -> sqlite3.Connection:
+    """Open a database connection with per-connection tuning applied"""
+    # Connections are cached per thread but closed from whichever thread stops tracking
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA wal_autocheckpoint={SQLITE_WAL_AUTOCHECKPOINT}")
+    conn.execute(f"PRAGMA journal_size_limit={SQLITE_JOURNAL_SIZE_LIMIT}")
+    return conn
+
+def _incremental_vacuum(conn: sqlite3.Connection, schema: str = "main"):
+    """Return free pages of one schema to the filesystem"""
+    # executescript steps the pragma to completion; execute() would free a single page
+    conn.executescript(f"PRAGMA {schema}.incremental_vacuum({SQLITE_VACUUM_PAGES});")
+
+def quantize_perf_sample(fps: float, cpu: float, gpu: float, mem_mb: float) -> Tuple[int, int, int, int]:
+    """Quantize a performance sample to uint16 fixed-point (0.1 resolution, whole MB)"""
+    return (
+        min(max(int(fps * 10), 0), PERF_SAMPLE_MAX),
+        min(max(int(cpu * 10), 0), PERF_SAMPLE_MAX),
+        min(max(int(gpu * 10), 0), PERF_SAMPLE_MAX),
+        min(max(int(mem_mb), 0), PERF_SAMPLE_MAX)
+    )
+
+def unpack_perf_samples(payload: bytes):
+    """Unpack concatenated packed samples into rows of (fps, cpu, gpu, mem)"""
+    if NUMPY_AVAILABLE:
+        return np.frombuffer(payload, dtype='<u2').reshape(-1, 4)
+    return list(PERF_SAMPLE_STRUCT.iter_unpack(payload))
+
+def summarize_perf_samples(window) -> Dict[str, float]:
+    """Compute avg/min/max over quantized samples"""
+    count = len(window)
+    if not count:
+        return {}
+    
+    if NUMPY_AVAILABLE:
+        avg, low, high = window.mean(axis=0), window.min(axis=0), window.max(axis=0)
+    else:
+        columns = list(zip(*window))
+        avg = [sum(column) / count for column in columns]
+        low = [min(column) for column in columns]
+        high = [max(column) for column in columns]
+    
+    return {
+        'samples': count,
+        'avg_fps': float(avg[0]) / 10,
+        'min_fps': float(low[0]) / 10,
+        'max_fps': float(high[0]) / 10,
+        'avg_cpu_usage': float(avg[1]) / 10,
+        'max_cpu_usage': float(high[1]) / 10,
+        'avg_gpu_usage': float(avg[2]) / 10,
+        'avg_memory_mb': float(avg[3]),
+        'max_memory_mb': float(high[3])
+    }
+
 @dataclass
 class GameSession:
     """Game session tracking data"""
@@ -75,7 +187,6 @@ class GameSession:
     end_time: Optional[datetime]
     duration_seconds: int
     achievements_unlocked: List[str]
-    performance_metrics: Dict[str, float]
     session_notes: str
     anonymized: bool
 
@@ -135,9 +246,16 @@ class UniversalGameDetector:
         self.running_games = {}
         self.game_databases = {}
         
+        # Per-process CPU time from the previous scan, for usage deltas
+        self._prev_proc_cpu: Dict[int, float] = {}
+        self._prev_cpu_sample_time = 0.0
+        
         # Load game databases
         self._load_game_databases()
         
+        # Compile game directory matcher once
+        self._matches_game_directory = self._compile_game_directory_matcher()
+        
         logger.info("🎮 Universal Game Detector initialized")
     
     def _load_game_databases(self):
@@ -177,14 +295,44 @@ class UniversalGameDetector:
             'valorant.exe': {'name': 'Valorant', 'platform': 'standalone'}
         }
     
+    def _compile_game_directory_matcher(self):
+        """Compile all game directory keywords into a single-pass matcher"""
+        if HYPERSCAN_AVAILABLE:
+            try:
+                database = hyperscan.Database()
+                database.compile(
+                    expressions=[re.escape(keyword).encode() for keyword in GAME_DIRECTORY_KEYWORDS],
+                    flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(GAME_DIRECTORY_KEYWORDS)
+                )
+                
+                def match_hyperscan(exe_path: str) -> bool:
+                    matched = []
+                    database.scan(exe_path.encode(), match_event_handler=lambda *_: matched.append(True))
+                    return bool(matched)
+                
+                return match_hyperscan
+                
+            except Exception as e:
+                logger.warning(f"⚠️ Hyperscan compile failed, using re: {e}")
+        
+        pattern = re.compile('|'.join(re.escape(keyword) for keyword in GAME_DIRECTORY_KEYWORDS), re.IGNORECASE)
+        return lambda exe_path: pattern.search(exe_path) is not None
+    
     def detect_running_games(self) -> List[Dict[str, Any]]:
         """Detect currently running games"""
         detected_games = []
         
+        # CPU usage is derived from cpu_times deltas between scans rather than
+        # psutil's per-process cpu_percent, which needs its own pair of reads
+        sample_time = time.monotonic()
+        elapsed = sample_time - self._prev_cpu_sample_time if self._prev_cpu_sample_time else 0.0
+        proc_cpu = {}
+        
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'exe', 'create_time', 'cpu_percent', 'memory_info']):
+            for proc in psutil.process_iter(['pid', 'name', 'exe', 'create_time', 'cpu_times', 'memory_info']):
                 try:
                     proc_name = proc.info['name'].lower()
+                    proc.info['cpu_percent'] = self._sample_cpu_percent(proc.info, proc_cpu, elapsed)
                     
                     # Check against game databases
                     game_info = self._identify_game(proc_name, proc.info)
@@ -203,7 +351,7 @@ class UniversalGameDetector:
                             'duration_seconds': int(duration),
                             'cpu_usage': proc.info['cpu_percent'],
                             'memory_usage_mb': proc.info['memory_info'].rss / (1024*1024),
-                            'exe_path': proc.info.get('exe', '')
+                            'exe_path': proc.info.get('exe') or ''
                         }
                         
                         detected_games.append(detected_game)
@@ -214,8 +362,28 @@ class UniversalGameDetector:
         except Exception as e:
             logger.error(f"❌ Game detection failed: {e}")
         
+        self._prev_proc_cpu = proc_cpu
+        self._prev_cpu_sample_time = sample_time
+        
         return detected_games
     
+    def _sample_cpu_percent(self, proc_info: Dict[str, Any], proc_cpu: Dict[int, float], elapsed: float) -> float:
+        """Record a process's CPU time and return its usage since the previous scan"""
+        cpu_times = proc_info.get('cpu_times')
+        if cpu_times is None:
+            return 0.0
+        
+        pid = proc_info['pid']
+        cpu_total = cpu_times.user + cpu_times.system
+        proc_cpu[pid] = cpu_total
+        
+        prev_total = self._prev_proc_cpu.get(pid)
+        if prev_total is None or elapsed <= 0:
+            return 0.0
+        
+        # Same scale as psutil's Process.cpu_percent (100 per busy core)
+        return max(cpu_total - prev_total, 0.0) / elapsed * 100
+    
     def _identify_game(self, proc_name: str, proc_info: Dict[str, Any]) -> Optional[Dict[str, str]]:
         """Identify if process is a known game"""
         
@@ -245,16 +413,10 @@ class UniversalGameDetector:
         if proc_name in system_processes:
             return False
         
-        # Check for game-like characteristics
-        exe_path = proc_info.get('exe', '').lower()
+        # Check for game-like characteristics (common game directories)
+        exe_path = proc_info.get('exe') or ''
         
-        # Common game directories
-        game_directories = [
-            'steam', 'games', 'epic games', 'gog galaxy', 'origin',
-            'uplay', 'battle.net', 'minecraft'
-        ]
-        
-        if any(game_dir in exe_path for game_dir in game_directories):
+        if exe_path and self._matches_game_directory(exe_path):
             return True
         
         # Check CPU usage (games typically use more CPU)
@@ -307,6 +469,107 @@ class UniversalGameDetector:
         
         return window_info
 
+class ThreadLocalConnections:
+    """
+    Long-lived SQLite connections, one per thread
+    Keeps the page cache warm instead of reconnecting on every call
+    """
+    
+    def __init__(self, factory):
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._open = []
+    
+    def get(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._factory()
+            self._local.conn = conn
+            with self._lock:
+                self._open.append(conn)
+        return conn
+    
+    def close_all(self):
+        """Close every cached connection"""
+        with self._lock:
+            for conn in self._open:
+                conn.close()
+            self._open.clear()
+            self._local = threading.local()
+
+class NotificationRing:
+    """
+    Preallocated ring buffer of achievement notifications
+    Rows are (timestamp, game_id, achievement_id, points) with strings interned to ids
+    """
+    
+    def __init__(self, capacity: int = NOTIFICATION_RING_SIZE):
+        self.capacity = capacity
+        self.write_index = 0  # total notifications written, never wraps
+        self._string_ids = {}
+        self._strings = []
+        
+        if NUMPY_AVAILABLE:
+            self._rows = np.zeros(capacity, dtype=[('ts', 'u8'), ('game_id', 'u4'), ('ach_id', 'u4'), ('pts', 'u2')])
+        else:
+            self._rows = [(0, 0, 0, 0)] * capacity
+    
+    def __len__(self) -> int:
+        return min(self.write_index, self.capacity)
+    
+    def _intern(self, value: str) -> int:
+        """Map a string to a stable integer id"""
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+    
+    def push(self, game_title: str, achievement_name: str, points_value: int):
+        """Write one notification row, overwriting the oldest when full"""
+        self._rows[self.write_index % self.capacity] = (
+            int(time.time()),
+            self._intern(game_title),
+            self._intern(achievement_name),
+            min(max(points_value, 0), 0xFFFF)
+        )
+        self.write_index += 1
+    
+    def since(self, last_seen: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Get notifications written after cursor last_seen, plus the new cursor"""
+        write_index = self.write_index
+        start = max(last_seen, write_index - self.capacity, 0)
+        
+        notifications = [
+            self._to_notification(self._rows[index % self.capacity])
+            for index in range(start, write_index)
+        ]
+        return notifications, write_index
+    
+    def recent(self, count: int) -> List[Dict[str, Any]]:
+        """Get the most recent notifications, oldest first"""
+        notifications, _ = self.since(self.write_index - count)
+        return notifications
+    
+    def _to_notification(self, row) -> Dict[str, Any]:
+        """Materialize a ring row as a notification dict"""
+        ts, game_id, ach_id, points_value = (int(value) for value in row)
+        game_title = self._strings[game_id]
+        achievement_name = self._strings[ach_id]
+        
+        return {
+            'type': 'achievement_unlocked',
+            'title': '🏆 Achievement Unlocked!',
+            'message': f'{achievement_name} in {game_title}',
+            'timestamp': datetime.fromtimestamp(ts).isoformat(),
+            'game': game_title,
+            'achievement': achievement_name,
+            'points_value': points_value
+        }
+
 class AchievementTracker:
     """
     Cross-platform achievement tracking
@@ -315,39 +578,58 @@ class AchievementTracker:
     
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        self.partition_dir = db_path.parent / "ach"
         self.achievement_cache = {}
         self.milestone_progress = defaultdict(float)
-        self.notification_queue = deque(maxlen=100)
+        self.notification_queue = NotificationRing()
+        self._connections = ThreadLocalConnections(self._connect)
+        self._schema = "main"
         
         self._init_achievements_database()
         
+        # (game_title, achievement_name) pairs already at full progress
+        self._unlocked = self._load_unlocked_achievements()
+        
         logger.info("🏆 Achievement Tracker initialized")
     
     def _init_achievements_database(self):
         """Initialize achievements database"""
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.partition_dir.mkdir(parents=True, exist_ok=True)
         
         try:
-            conn = sqlite3.connect(self.db_path)
+            _configure_db(self.db_path)
+            for platform in ACHIEVEMENT_PLATFORMS:
+                _configure_db(self.partition_dir / f"{platform}.db")
+            
+            conn = _connect_db(self.db_path)
+            self._attach_partitions(conn)
             cursor = conn.cursor()
             
-            # Achievements table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS achievements (
-                    achievement_id TEXT PRIMARY KEY,
-                    game_title TEXT NOT NULL,
-                    achievement_name TEXT,
-                    achievement_description TEXT,
-                    unlock_timestamp TEXT,
-                    unlock_progress REAL DEFAULT 0.0,
-                    difficulty_rating TEXT,
-                    achievement_type TEXT,
-                    points_value INTEGER DEFAULT 0,
-                    rarity REAL DEFAULT 0.0,
-                    platform TEXT,
-                    verified BOOLEAN DEFAULT 0
-                )
-            ''')
+            # Achievements table, one per platform partition
+            for platform in ACHIEVEMENT_PLATFORMS:
+                cursor.execute(f'''
+                    CREATE TABLE IF NOT EXISTS {platform}.achievements (
+                        achievement_id TEXT PRIMARY KEY,
+                        game_title TEXT NOT NULL,
+                        achievement_name TEXT,
+                        achievement_description TEXT,
+                        unlock_timestamp TEXT,
+                        unlock_progress REAL DEFAULT 0.0,
+                        difficulty_rating TEXT,
+                        achievement_type TEXT,
+                        points_value INTEGER DEFAULT 0,
+                        rarity REAL DEFAULT 0.0,
+                        platform TEXT,
+                        verified BOOLEAN DEFAULT 0
+                    )
+                ''')
+                
+                cursor.execute(f'''
+                    CREATE INDEX IF NOT EXISTS {platform}.idx_ach_game_name
+                    ON achievements (game_title, achievement_name)
+                ''')
+            
+            self._migrate_unpartitioned_achievements(cursor)
             
             # Milestones table
             cursor.execute('''
@@ -384,6 +666,125 @@ class AchievementTracker:
         except Exception as e:
             logger.error(f"❌ Failed to initialize achievements database: {e}")
     
+    def _attach_partitions(self, conn: sqlite3.Connection):
+        """Attach every platform partition and expose them as one view"""
+        for platform in ACHIEVEMENT_PLATFORMS:
+            conn.execute(f"ATTACH DATABASE ? AS {platform}", (str(self.partition_dir / f"{platform}.db"),))
+            conn.execute(f"PRAGMA {platform}.synchronous=NORMAL")
+            conn.execute(f"PRAGMA {platform}.journal_size_limit={SQLITE_JOURNAL_SIZE_LIMIT}")
+        
+        union = " UNION ALL ".join(f"SELECT * FROM {platform}.achievements" for platform in ACHIEVEMENT_PLATFORMS)
+        conn.execute(f"CREATE TEMP VIEW IF NOT EXISTS all_achievements AS {union}")
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the achievements database with platform partitions attached"""
+        conn = _connect_db(self.db_path)
+        self._attach_partitions(conn)
+        return conn
+    
+    def attach_to(self, conn: sqlite3.Connection, schema: str = ACHIEVEMENTS_SCHEMA):
+        """Attach the achievements database and its partitions to another database's connection"""
+        conn.execute(f"ATTACH DATABASE ? AS {schema}", (str(self.db_path),))
+        conn.execute(f"PRAGMA {schema}.synchronous=NORMAL")
+        conn.execute(f"PRAGMA {schema}.journal_size_limit={SQLITE_JOURNAL_SIZE_LIMIT}")
+        self._attach_partitions(conn)
+    
+    def use_connections(self, connections: ThreadLocalConnections, schema: str = ACHIEVEMENTS_SCHEMA):
+        """Query through a shared pool whose connections have this database attached"""
+        # Unqualified table names resolve through attached schemas, so queries stay unchanged
+        self._connections.close_all()
+        self._connections = connections
+        self._schema = schema
+    
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the calling thread's achievements connection"""
+        return self._connections.get()
+    
+    def close(self):
+        """Close all cached database connections"""
+        self._connections.close_all()
+    
+    def run_maintenance(self):
+        """Reclaim free pages in the achievements database and its partitions"""
+        try:
+            conn = self._get_conn()
+            _incremental_vacuum(conn, self._schema)
+            for platform in ACHIEVEMENT_PLATFORMS:
+                _incremental_vacuum(conn, platform)
+        except Exception as e:
+            logger.error(f"❌ Achievements database maintenance failed: {e}")
+    
+    def _load_unlocked_achievements(self) -> set:
+        """Load the set of fully unlocked achievements"""
+        try:
+            conn = self._get_conn()
+            unlocked = set(conn.execute('''
+                SELECT game_title, achievement_name FROM all_achievements WHERE unlock_progress >= 1.0
+            ''').fetchall())
+            return unlocked
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to load unlocked achievements: {e}")
+            return set()
+    
+    def _partition_for(self, platform: Optional[str]) -> str:
+        """Get the partition schema name for a platform"""
+        return platform if platform in ACHIEVEMENT_PLATFORMS else 'unknown'
+    
+    def _migrate_unpartitioned_achievements(self, cursor: sqlite3.Cursor):
+        """Move rows from the legacy single achievements table into partitions"""
+        cursor.execute("SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'achievements'")
+        if not cursor.fetchone():
+            return
+        
+        partitioned_rows = defaultdict(list)
+        for row in cursor.execute("SELECT * FROM main.achievements").fetchall():
+            partitioned_rows[self._partition_for(row[10])].append(row)
+        
+        for partition, rows in partitioned_rows.items():
+            cursor.executemany(f'''
+                INSERT OR IGNORE INTO {partition}.achievements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+        
+        cursor.execute("DROP TABLE main.achievements")
+        logger.info(f"📦 Migrated {sum(len(rows) for rows in partitioned_rows.values())} achievements into platform partitions")
+    
+    def store_achievements(self, achievements: List[GameAchievement]):
+        """Store achievements in their platform partitions"""
+        partitioned_rows = defaultdict(list)
+        for achievement in achievements:
+            partitioned_rows[self._partition_for(achievement.platform)].append((
+                achievement.achievement_id,
+                achievement.game_title,
+                achievement.achievement_name,
+                achievement.achievement_description,
+                achievement.unlock_timestamp.isoformat() if achievement.unlock_timestamp else None,
+                achievement.unlock_progress,
+                achievement.difficulty_rating,
+                achievement.achievement_type,
+                achievement.points_value,
+                achievement.rarity,
+                achievement.platform,
+                achievement.verified
+            ))
+        
+        try:
+            # One transaction for the whole batch
+            with self._get_conn() as conn:
+                for partition, rows in partitioned_rows.items():
+                    conn.executemany(f'''
+                        INSERT OR REPLACE INTO {partition}.achievements
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', rows)
+            
+            self._unlocked.update(
+                (achievement.game_title, achievement.achievement_name)
+                for achievement in achievements if achievement.unlock_progress >= 1.0
+            )
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to store achievements: {e}")
+    
     def fetch_achievements_from_platforms(self, game_title: str, platforms: List[str]) -> List[GameAchievement]:
         """Fetch achievements from gaming platforms"""
         achievements = []
@@ -498,66 +899,115 @@ class AchievementTracker:
     def update_achievement_progress(self, game_title: str, achievement_name: str, 
                                   progress: float, session_id: str):
         """Update achievement progress"""
+        # Fast path: progress can never rise past an unlocked achievement
+        if (game_title, achievement_name) in self._unlocked:
+            return
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Find achievement
-            cursor.execute('''
-                SELECT achievement_id, unlock_progress FROM achievements 
-                WHERE game_title = ? AND achievement_name = ?
-            ''', (game_title, achievement_name))
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                
+                # Find achievement
+                cursor.execute('''
+                    SELECT achievement_id, unlock_progress, points_value, platform FROM all_achievements 
+                    WHERE game_title = ? AND achievement_name = ?
+                ''', (game_title, achievement_name))
+                
+                result = cursor.fetchone()
+                if result:
+                    achievement_id, current_progress, points_value, platform = result
+                    
+                    # Update progress if it's higher
+                    if progress > current_progress:
+                        cursor.execute(f'''
+                            UPDATE {self._partition_for(platform)}.achievements 
+                            SET unlock_progress = ?, unlock_timestamp = ?
+                            WHERE achievement_id = ?
+                        ''', (
+                            progress,
+                            datetime.now().isoformat() if progress >= 1.0 else None,
+                            achievement_id
+                        ))
+                        
+                        # Log progress
+                        cursor.execute('''
+                            INSERT INTO achievement_progress VALUES (?, ?, ?, ?, ?)
+                        ''', (
+                            str(uuid.uuid4()),
+                            achievement_id,
+                            progress,
+                            datetime.now().isoformat(),
+                            session_id
+                        ))
+                        
+                        # Check if achievement was unlocked
+                        if progress >= 1.0 and current_progress < 1.0:
+                            self._trigger_achievement_notification(achievement_name, game_title, points_value or 0)
             
-            result = cursor.fetchone()
-            if result:
-                achievement_id, current_progress = result
+        except Exception as e:
+            logger.error(f"❌ Failed to update achievement progress: {e}")
+    
+    def advance_achievement_progress(self, game_title: str, increments: Dict[str, float],
+                                     session_id: str):
+        """Add progress increments to several achievements of one game in a single transaction"""
+        # Unlocked achievements cannot progress further
+        pending = {name: increment for name, increment in increments.items()
+                   if (game_title, name) not in self._unlocked}
+        if not pending:
+            return
+        
+        unlocked = []
+        try:
+            with self._get_conn() as conn:
+                placeholders = ', '.join('?' * len(pending))
+                rows = conn.execute(f'''
+                    SELECT achievement_id, achievement_name, unlock_progress, points_value, platform
+                    FROM all_achievements
+                    WHERE game_title = ? AND achievement_name IN ({placeholders})
+                ''', (game_title, *pending)).fetchall()
                 
-                # Update progress if it's higher
-                if progress > current_progress:
-                    cursor.execute('''
-                        UPDATE achievements 
-                        SET unlock_progress = ?, unlock_timestamp = ?
-                        WHERE achievement_id = ?
-                    ''', (
-                        progress,
-                        datetime.now().isoformat() if progress >= 1.0 else None,
-                        achievement_id
-                    ))
+                now = datetime.now().isoformat()
+                updates = defaultdict(list)
+                progress_log = []
+                
+                for achievement_id, achievement_name, current_progress, points_value, platform in rows:
+                    progress = min(current_progress + pending[achievement_name], 1.0)
+                    if progress <= current_progress:
+                        continue
                     
-                    # Log progress
-                    cursor.execute('''
-                        INSERT INTO achievement_progress VALUES (?, ?, ?, ?, ?)
-                    ''', (
-                        str(uuid.uuid4()),
-                        achievement_id,
-                        progress,
-                        datetime.now().isoformat(),
-                        session_id
-                    ))
+                    updates[self._partition_for(platform)].append(
+                        (progress, now if progress >= 1.0 else None, achievement_id)
+                    )
+                    progress_log.append((str(uuid.uuid4()), achievement_id, progress, now, session_id))
                     
-                    # Check if achievement was unlocked
-                    if progress >= 1.0 and current_progress < 1.0:
-                        self._trigger_achievement_notification(achievement_name, game_title)
-            
-            conn.commit()
-            conn.close()
+                    if progress >= 1.0:
+                        unlocked.append((achievement_name, points_value or 0))
+                
+                for partition, params in updates.items():
+                    conn.executemany(f'''
+                        UPDATE {partition}.achievements 
+                        SET unlock_progress = ?, unlock_timestamp = ?
+                        WHERE achievement_id = ?
+                    ''', params)
+                
+                conn.executemany('''
+                    INSERT INTO achievement_progress VALUES (?, ?, ?, ?, ?)
+                ''', progress_log)
             
         except Exception as e:
             logger.error(f"❌ Failed to update achievement progress: {e}")
+            return
+        
+        for achievement_name, points_value in unlocked:
+            self._trigger_achievement_notification(achievement_name, game_title, points_value)
     
-    def _trigger_achievement_notification(self, achievement_name: str, game_title: str):
+    def _trigger_achievement_notification(self, achievement_name: str, game_title: str, points_value: int = 0):
         """Trigger achievement unlock notification"""
-        notification = {
-            'type': 'achievement_unlocked',
-            'title': f'🏆 Achievement Unlocked!',
-            'message': f'{achievement_name} in {game_title}',
-            'timestamp': datetime.now().isoformat(),
-            'game': game_title,
-            'achievement': achievement_name
-        }
+        self._unlocked.add((game_title, achievement_name))
+        self.notification_queue.push(game_title, achievement_name, points_value)
         
-        self.notification_queue.append(notification)
-        logger.info(f"🏆 Achievement unlocked: {achievement_name} in {game_title}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"🏆 Achievement unlocked: {achievement_name} in {game_title}")
     
     def create_milestone(self, game_title: str, milestone_type: str, 
                         milestone_name: str, target_value: float) -> str:
@@ -579,27 +1029,24 @@ class AchievementTracker:
                 shared_publicly=SHARE_ACHIEVEMENTS_PUBLICLY
             )
             
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT INTO milestones VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                milestone.milestone_id,
-                milestone.game_title,
-                milestone.milestone_type,
-                milestone.milestone_name,
-                milestone.milestone_description,
-                milestone.target_value,
-                milestone.current_value,
-                milestone.achieved,
-                milestone.achieved_timestamp,
-                milestone.reward_type,
-                milestone.shared_publicly
-            ))
-            
-            conn.commit()
-            conn.close()
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                    INSERT INTO milestones VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    milestone.milestone_id,
+                    milestone.game_title,
+                    milestone.milestone_type,
+                    milestone.milestone_name,
+                    milestone.milestone_description,
+                    milestone.target_value,
+                    milestone.current_value,
+                    milestone.achieved,
+                    milestone.achieved_timestamp,
+                    milestone.reward_type,
+                    milestone.shared_publicly
+                ))
             
             logger.info(f"📍 Created milestone: {milestone_name} for {game_title}")
             return milestone_id
@@ -611,7 +1058,7 @@ class AchievementTracker:
     def get_achievement_summary(self, game_title: Optional[str] = None) -> Dict[str, Any]:
         """Get achievement summary"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
             # Base query
@@ -619,19 +1066,19 @@ class AchievementTracker:
             params = [game_title] if game_title else []
             
             # Total achievements
-            cursor.execute(f"SELECT COUNT(*) FROM achievements {where_clause}", params)
+            cursor.execute(f"SELECT COUNT(*) FROM all_achievements {where_clause}", params)
             total_achievements = cursor.fetchone()[0]
             
             # Unlocked achievements
             cursor.execute(f'''
-                SELECT COUNT(*) FROM achievements 
+                SELECT COUNT(*) FROM all_achievements 
                 {where_clause} {"AND" if game_title else "WHERE"} unlock_progress >= 1.0
             ''', params)
             unlocked_achievements = cursor.fetchone()[0]
             
             # Total points
             cursor.execute(f'''
-                SELECT SUM(points_value) FROM achievements 
+                SELECT SUM(points_value) FROM all_achievements 
                 {where_clause} {"AND" if game_title else "WHERE"} unlock_progress >= 1.0
             ''', params)
             total_points = cursor.fetchone()[0] or 0
@@ -639,8 +1086,6 @@ class AchievementTracker:
             # Completion percentage
             completion_percentage = (unlocked_achievements / total_achievements * 100) if total_achievements > 0 else 0
             
-            conn.close()
-            
             return {
                 'game_title': game_title or 'All Games',
                 'total_achievements': total_achievements,
@@ -657,7 +1102,7 @@ class AchievementTracker:
     def _get_recent_achievement_unlocks(self, game_title: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get recent achievement unlocks"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
             where_clause = "WHERE unlock_timestamp IS NOT NULL"
@@ -669,7 +1114,7 @@ class AchievementTracker:
             
             cursor.execute(f'''
                 SELECT achievement_name, game_title, unlock_timestamp, points_value 
-                FROM achievements 
+                FROM all_achievements 
                 {where_clause}
                 ORDER BY unlock_timestamp DESC 
                 LIMIT 5
@@ -684,7 +1129,6 @@ class AchievementTracker:
                     'points_value': row[3]
                 })
             
-            conn.close()
             return recent_unlocks
             
         except Exception as e:
@@ -700,58 +1144,140 @@ class SessionManager:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.active_sessions = {}
+        self.sessions_by_title: Dict[str, str] = {}  # game_title -> active session_id
+        
+        # Dashboard rows for active sessions, formatted once: session_id -> (monotonic start, row)
+        self._active_summary: Dict[str, Tuple[float, Dict[str, Any]]] = {}
         self.session_history = deque(maxlen=1000)
         self.performance_tracker = None
+        self._connections = ThreadLocalConnections(lambda: _connect_db(self.db_path))
+        
+        # Packed performance samples waiting for the next batched write
+        self._pending_samples: List[Tuple[str, int, bytes]] = []
+        self._pending_lock = threading.Lock()
+        
+        # (game_title, days) -> (computed_at, stats); cleared whenever a session is stored
+        self._stats_cache: Dict[Tuple[Optional[str], int], Tuple[float, Dict[str, Any]]] = {}
         
         self._init_sessions_database()
         
         logger.info("⏱️ Session Manager initialized")
     
+    def _get_conn(self) -> sqlite3.Connection:
+        """Get the calling thread's sessions connection"""
+        return self._connections.get()
+    
+    def use_connections(self, connections: ThreadLocalConnections):
+        """Query through a shared pool whose connections open this database as main"""
+        self._connections.close_all()
+        self._connections = connections
+    
+    def close(self):
+        """Close all cached database connections"""
+        self._connections.close_all()
+    
+    def run_maintenance(self):
+        """Reclaim free pages in the sessions database"""
+        try:
+            _incremental_vacuum(self._get_conn())
+        except Exception as e:
+            logger.error(f"❌ Sessions database maintenance failed: {e}")
+    
     def _init_sessions_database(self):
         """Initialize sessions database"""
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Game sessions table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS game_sessions (
-                    session_id TEXT PRIMARY KEY,
-                    game_title TEXT NOT NULL,
-                    game_executable TEXT,
-                    platform TEXT,
-                    start_time TEXT,
-                    end_time TEXT,
-                    duration_seconds INTEGER,
-                    achievements_unlocked TEXT,
-                    performance_metrics TEXT,
-                    session_notes TEXT,
-                    anonymized BOOLEAN DEFAULT 1
-                )
-            ''')
+            _configure_db(self.db_path)
             
-            # Session analytics
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS session_analytics (
-                    analytics_id TEXT PRIMARY KEY,
-                    date TEXT,
-                    total_playtime_minutes INTEGER,
-                    games_played INTEGER,
-                    achievements_earned INTEGER,
-                    avg_session_length INTEGER,
-                    most_played_game TEXT,
-                    performance_score REAL
-                )
-            ''')
-            
-            conn.commit()
-            conn.close()
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                legacy_timestamps = self._detach_legacy_sessions_table(cursor)
+                
+                # Game sessions table (start/end as Unix epoch seconds)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS game_sessions (
+                        session_id TEXT PRIMARY KEY,
+                        game_title TEXT NOT NULL,
+                        game_executable TEXT,
+                        platform TEXT,
+                        start_time INTEGER,
+                        end_time INTEGER,
+                        duration_seconds INTEGER,
+                        achievements_unlocked TEXT,
+                        performance_metrics TEXT,
+                        session_notes TEXT,
+                        anonymized BOOLEAN DEFAULT 1
+                    )
+                ''')
+                
+                # Playtime range scans, optionally per game
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_sessions_start ON game_sessions (start_time)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_sessions_game_start ON game_sessions (game_title, start_time DESC)
+                ''')
+                
+                if legacy_timestamps:
+                    self._migrate_legacy_sessions(cursor)
+                
+                # Performance samples (one row per sample, appended while a session runs)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS perf_samples (
+                        session_id TEXT NOT NULL,
+                        ts INTEGER NOT NULL,
+                        payload BLOB NOT NULL,
+                        PRIMARY KEY (session_id, ts)
+                    ) WITHOUT ROWID
+                ''')
+                
+                # Session analytics
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS session_analytics (
+                        analytics_id TEXT PRIMARY KEY,
+                        date TEXT,
+                        total_playtime_minutes INTEGER,
+                        games_played INTEGER,
+                        achievements_earned INTEGER,
+                        avg_session_length INTEGER,
+                        most_played_game TEXT,
+                        performance_score REAL
+                    )
+                ''')
             
         except Exception as e:
             logger.error(f"❌ Failed to initialize sessions database: {e}")
     
+    def _detach_legacy_sessions_table(self, cursor: sqlite3.Cursor) -> bool:
+        """Move aside a game_sessions table that stores ISO-8601 TEXT times"""
+        columns = {row[1]: row[2] for row in cursor.execute("PRAGMA table_info(game_sessions)")}
+        if columns.get('start_time') != 'TEXT':
+            return False
+        
+        # TEXT affinity would turn integers back into strings, so the table is rebuilt
+        cursor.execute("ALTER TABLE game_sessions RENAME TO game_sessions_legacy")
+        cursor.execute("DROP INDEX IF EXISTS idx_sessions_start")
+        cursor.execute("DROP INDEX IF EXISTS idx_sessions_game_start")
+        return True
+    
+    def _migrate_legacy_sessions(self, cursor: sqlite3.Cursor):
+        """Copy legacy sessions into game_sessions with epoch second timestamps"""
+        # isoformat() values are naive local times
+        cursor.execute('''
+            INSERT OR IGNORE INTO game_sessions
+            SELECT session_id, game_title, game_executable, platform,
+                   CAST(strftime('%s', start_time, 'utc') AS INTEGER),
+                   CAST(strftime('%s', end_time, 'utc') AS INTEGER),
+                   duration_seconds, achievements_unlocked, performance_metrics,
+                   session_notes, anonymized
+            FROM game_sessions_legacy
+        ''')
+        migrated = cursor.rowcount
+        
+        cursor.execute("DROP TABLE game_sessions_legacy")
+        logger.info(f"📦 Migrated {migrated} sessions to epoch timestamps")
+    
     def start_session(self, game_info: Dict[str, Any]) -> str:
         """Start a new game session"""
         try:
@@ -766,12 +1292,17 @@ class SessionManager:
                 end_time=None,
                 duration_seconds=0,
                 achievements_unlocked=[],
-                performance_metrics={},
                 session_notes="",
                 anonymized=AUTO_ANONYMIZE_SESSIONS
             )
             
             self.active_sessions[session_id] = session
+            self.sessions_by_title[session.game_title] = session_id
+            self._active_summary[session_id] = (time.monotonic(), {
+                'game_title': session.game_title,
+                'platform': session.platform,
+                'start_time': session.start_time.strftime('%H:%M')
+            })
             
             logger.info(f"🎮 Started session: {game_info['game_title']} ({session_id[:8]})")
             return session_id
@@ -780,16 +1311,72 @@ class SessionManager:
             logger.error(f"❌ Failed to start session: {e}")
             return ""
     
+    def get_active_summaries(self) -> List[Dict[str, Any]]:
+        """Get dashboard rows for active sessions"""
+        now = time.monotonic()
+        return [
+            dict(summary, duration_minutes=int(now - started) // 60)
+            for started, summary in list(self._active_summary.values())
+        ]
+    
     def update_session(self, session_id: str, performance_data: Dict[str, float]):
         """Update active session with performance data"""
         if session_id in self.active_sessions:
             session = self.active_sessions[session_id]
+            now = datetime.now()
             
             # Update duration
-            session.duration_seconds = int((datetime.now() - session.start_time).total_seconds())
+            session.duration_seconds = int((now - session.start_time).total_seconds())
+            
+            # Queue the quantized sample for perf_samples, the only store of session performance
+            sample = quantize_perf_sample(
+                performance_data.get('fps', 0.0),
+                performance_data.get('cpu_usage', 0.0),
+                performance_data.get('gpu_usage', 0.0),
+                performance_data.get('memory_usage_mb', 0.0)
+            )
             
-            # Update performance metrics
-            session.performance_metrics.update(performance_data)
+            with self._pending_lock:
+                self._pending_samples.append(
+                    (session_id, int(now.timestamp() * 1000), PERF_SAMPLE_STRUCT.pack(*sample))
+                )
+                flush_now = len(self._pending_samples) >= PERF_SAMPLE_FLUSH_BATCH
+            
+            if flush_now:
+                self.flush_pending_samples()
+    
+    def flush_pending_samples(self):
+        """Write buffered performance samples in a single transaction"""
+        with self._pending_lock:
+            rows, self._pending_samples = self._pending_samples, []
+        
+        if not rows:
+            return
+        
+        try:
+            with self._get_conn() as conn:
+                conn.executemany('''
+                    INSERT OR REPLACE INTO perf_samples VALUES (?, ?, ?)
+                ''', rows)
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to store performance samples: {e}")
+    
+    def get_session_performance(self, session_id: str) -> Dict[str, float]:
+        """Summarize every recorded performance sample of a session"""
+        self.flush_pending_samples()
+        
+        try:
+            conn = self._get_conn()
+            payload = b''.join(row[0] for row in conn.execute('''
+                SELECT payload FROM perf_samples WHERE session_id = ?
+            ''', (session_id,)))
+            
+            return summarize_perf_samples(unpack_perf_samples(payload))
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to get session performance: {e}")
+            return {}
     
     def end_session(self, session_id: str, notes: str = ""):
         """End a game session"""
@@ -804,10 +1391,14 @@ class SessionManager:
             session.session_notes = notes
             
             # Store session to database
+            self.flush_pending_samples()
             self._store_session(session)
             
             # Remove from active sessions
             del self.active_sessions[session_id]
+            self._active_summary.pop(session_id, None)
+            if self.sessions_by_title.get(session.game_title) == session_id:
+                del self.sessions_by_title[session.game_title]
             
             logger.info(f"🏁 Ended session: {session.game_title} (Duration: {session.duration_seconds//60}m)")
             
@@ -817,39 +1408,53 @@ class SessionManager:
     def _store_session(self, session: GameSession):
         """Store session to database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO game_sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                session.session_id,
-                session.game_title,
-                session.game_executable,
-                session.platform,
-                session.start_time.isoformat(),
-                session.end_time.isoformat() if session.end_time else None,
-                session.duration_seconds,
-                json.dumps(session.achievements_unlocked),
-                json.dumps(session.performance_metrics),
-                session.session_notes,
-                session.anonymized
-            ))
+            with self._get_conn() as conn:
+                cursor = conn.cursor()
+                
+                # Upsert in place; only the columns that change after start are rewritten
+                cursor.execute('''
+                    INSERT INTO game_sessions (
+                        session_id, game_title, game_executable, platform, start_time, end_time,
+                        duration_seconds, achievements_unlocked, performance_metrics, session_notes, anonymized
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (session_id) DO UPDATE SET
+                        end_time = excluded.end_time,
+                        duration_seconds = excluded.duration_seconds,
+                        achievements_unlocked = excluded.achievements_unlocked,
+                        performance_metrics = excluded.performance_metrics,
+                        session_notes = excluded.session_notes
+                ''', (
+                    session.session_id,
+                    session.game_title,
+                    session.game_executable,
+                    session.platform,
+                    int(session.start_time.timestamp()),
+                    int(session.end_time.timestamp()) if session.end_time else None,
+                    session.duration_seconds,
+                    json.dumps(session.achievements_unlocked),
+                    None,  # performance lives in perf_samples, see get_session_performance
+                    session.session_notes,
+                    session.anonymized
+                ))
             
-            conn.commit()
-            conn.close()
+            self._stats_cache.clear()
             
         except Exception as e:
             logger.error(f"❌ Failed to store session: {e}")
     
     def get_playtime_stats(self, game_title: Optional[str] = None, days: int = 30) -> Dict[str, Any]:
         """Get playtime statistics"""
+        cache_key = (game_title, days)
+        cached_at, cached_stats = self._stats_cache.get(cache_key, (0.0, None))
+        if cached_stats is not None and time.monotonic() - cached_at < PLAYTIME_STATS_CACHE_TTL:
+            return cached_stats
+        
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_conn()
             cursor = conn.cursor()
             
             # Date filter
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+            cutoff_date = int((datetime.now() - timedelta(days=days)).timestamp())
             
             # Build query
             where_clause = "WHERE start_time >= ?"
@@ -859,17 +1464,16 @@ class SessionManager:
                 where_clause += " AND game_title = ?"
                 params.append(game_title)
             
-            # Total playtime
+            # Per-game totals in one pass; overall totals are summed from them
             cursor.execute(f'''
-                SELECT SUM(duration_seconds) FROM game_sessions {where_clause}
+                SELECT game_title, SUM(duration_seconds), COUNT(*)
+                FROM game_sessions {where_clause}
+                GROUP BY game_title
             ''', params)
-            total_seconds = cursor.fetchone()[0] or 0
+            per_game = cursor.fetchall()
             
-            # Session count
-            cursor.execute(f'''
-                SELECT COUNT(*) FROM game_sessions {where_clause}
-            ''', params)
-            session_count = cursor.fetchone()[0]
+            total_seconds = sum(game_seconds or 0 for _, game_seconds, _ in per_game)
+            session_count = sum(game_sessions for _, _, game_sessions in per_game)
             
             # Average session length
             avg_session_length = total_seconds / session_count if session_count > 0 else 0
@@ -877,22 +1481,12 @@ class SessionManager:
             # Most played games (if not filtering by game)
             most_played = []
             if not game_title:
-                cursor.execute(f'''
-                    SELECT game_title, SUM(duration_seconds) as total_time
-                    FROM game_sessions {where_clause}
-                    GROUP BY game_title
-                    ORDER BY total_time DESC
-                    LIMIT 5
-                ''', params)
-                
                 most_played = [
-                    {'game': row[0], 'playtime_hours': row[1] / 3600}
-                    for row in cursor.fetchall()
+                    {'game': title, 'playtime_hours': (game_seconds or 0) / 3600}
+                    for title, game_seconds, _ in heapq.nlargest(5, per_game, key=lambda row: row[1] or 0)
                 ]
             
-            conn.close()
-            
-            return {
+            stats = {
                 'game_title': game_title or 'All Games',
                 'period_days': days,
                 'total_playtime_hours': total_seconds / 3600,
@@ -901,6 +1495,9 @@ class SessionManager:
                 'most_played_games': most_played
             }
             
+            self._stats_cache[cache_key] = (time.monotonic(), stats)
+            return stats
+            
         except Exception as e:
             logger.error(f"❌ Failed to get playtime stats: {e}")
             return {}
@@ -917,15 +1514,38 @@ class UniversalGameTracker:
         self.achievement_tracker = AchievementTracker(GAME_TRACKER_ACHIEVEMENTS_DB)
         self.session_manager = SessionManager(GAME_TRACKER_DB_PATH)
         
+        # One pooled handle per thread for both databases: sessions as main, achievements attached
+        self._connections = ThreadLocalConnections(self._connect_databases)
+        self.session_manager.use_connections(self._connections)
+        self.achievement_tracker.use_connections(self._connections)
+        
         # System state
         self.tracking_active = False
         self.privacy_consent_given = False
+        self._shutdown = threading.Event()
+        self._threads: List[threading.Thread] = []
+        
+        # Game processes seen by the previous detection scan: pid -> game_title
+        self._game_pids: Dict[int, str] = {}
+        
+        # Pending achievement checks as a (monotonic due time, session_id) min-heap
+        self._achievement_schedule: List[Tuple[float, str]] = []
+        self._achievement_schedule_cond = threading.Condition()
+        
+        # Stored consent record, read once and replaced when the user is asked again
+        self._consent = self._load_tracking_consent()
         
         # Initialize directories
         self._init_directories()
         
         logger.info("🚀 Universal Game Tracker initialized")
     
+    def _connect_databases(self) -> sqlite3.Connection:
+        """Open the sessions database with the achievements databases attached"""
+        conn = _connect_db(self.session_manager.db_path)
+        self.achievement_tracker.attach_to(conn)
+        return conn
+    
     def _init_directories(self):
         """Initialize tracking directories"""
         GAME_TRACKER_DATA_PATH.mkdir(parents=True, exist_ok=True)
@@ -938,35 +1558,51 @@ class UniversalGameTracker:
         
         self.tracking_active = True
         self.privacy_consent_given = True
+        self._shutdown.clear()
         
         # Start tracking threads
-        detection_thread = threading.Thread(target=self._game_detection_loop, daemon=True)
-        session_thread = threading.Thread(target=self._session_management_loop, daemon=True)
-        achievement_thread = threading.Thread(target=self._achievement_tracking_loop, daemon=True)
+        self._threads = [
+            threading.Thread(target=self._game_detection_loop, daemon=True),
+            threading.Thread(target=self._session_management_loop, daemon=True),
+            threading.Thread(target=self._achievement_tracking_loop, daemon=True),
+            threading.Thread(target=self._sample_flush_loop, daemon=True)
+        ]
         
-        detection_thread.start()
-        session_thread.start()
-        achievement_thread.start()
+        for thread in self._threads:
+            thread.start()
         
         logger.info("🚀 Game tracking started")
         return True
     
-    def _check_tracking_consent(self) -> bool:
-        """Check if user has given tracking consent"""
+    def _load_tracking_consent(self) -> Optional[Dict[str, Any]]:
+        """Load the saved consent record, if any"""
         consent_file = GAME_TRACKER_DATA_PATH / "tracking_consent.json"
         
         if consent_file.exists():
             try:
                 with open(consent_file, 'r') as f:
-                    consent_data = json.load(f)
-                return consent_data.get('consent_given', False)
+                    return json.load(f)
             except:
                 pass
         
+        return None
+    
+    def _check_tracking_consent(self) -> bool:
+        """Check if user has given tracking consent"""
+        if self._consent is not None:
+            return self._consent.get('consent_given', False)
+        
         return self._request_tracking_consent()
     
     def _request_tracking_consent(self) -> bool:
         """Request user consent for game tracking"""
+        # Headless startup cannot prompt; take the answer from the environment
+        if sys.stdin is None or not sys.stdin.isatty():
+            consent_given = os.environ.get(TRACKING_CONSENT_ENV, "") == "1"
+            if not consent_given:
+                logger.warning(f"⚠️ No terminal for consent prompt; set {TRACKING_CONSENT_ENV}=1 to enable tracking")
+            return consent_given
+        
         print("\n🎮 GAME TRACKING PRIVACY NOTICE")
         print("="*40)
         print("📊 What we track:")
@@ -1002,6 +1638,7 @@ class UniversalGameTracker:
         with open(consent_file, 'w') as f:
             json.dump(consent_data, f, indent=2)
         
+        self._consent = consent_data
         return consent_given
     
     def _game_detection_loop(self):
@@ -1010,31 +1647,41 @@ class UniversalGameTracker:
             try:
                 # Detect running games
                 running_games = self.game_detector.detect_running_games()
+                current_pids = {game['pid']: game['game_title'] for game in running_games}
                 
                 # Process detected games
                 for game_info in running_games:
                     self._process_detected_game(game_info)
                 
-                time.sleep(GAME_DETECTION_INTERVAL)
+                # Only processes that exited since the last scan can end a session
+                stopped_titles = {self._game_pids[pid] for pid in self._game_pids.keys() - current_pids.keys()}
+                if stopped_titles:
+                    stopped_titles.difference_update(current_pids.values())
+                    for title in stopped_titles:
+                        session_id = self.session_manager.sessions_by_title.get(title)
+                        if session_id:
+                            self.session_manager.end_session(session_id, "Game process ended")
+                
+                self._game_pids = current_pids
+                
+                self._shutdown.wait(GAME_DETECTION_INTERVAL)
                 
             except Exception as e:
                 logger.error(f"❌ Game detection loop error: {e}")
-                time.sleep(10)
+                self._shutdown.wait(10)
     
     def _process_detected_game(self, game_info: Dict[str, Any]):
         """Process a detected game"""
         game_title = game_info['game_title']
         
         # Check if we already have an active session for this game
-        existing_session = None
-        for session_id, session in self.session_manager.active_sessions.items():
-            if session.game_title == game_title:
-                existing_session = session_id
-                break
+        existing_session = self.session_manager.sessions_by_title.get(game_title)
         
         if not existing_session:
             # Start new session
             session_id = self.session_manager.start_session(game_info)
+            if session_id:
+                self._schedule_achievement_check(session_id, time.monotonic() + ACHIEVEMENT_CHECK_INTERVAL)
             
             # Fetch achievements for this game
             if game_info['platform'] in ['steam', 'epic', 'xbox']:
@@ -1043,118 +1690,91 @@ class UniversalGameTracker:
                 )
                 # Store achievements if we got any
                 if achievements:
-                    self._store_achievements(achievements)
+                    self.achievement_tracker.store_achievements(achievements)
         else:
             # Update existing session
             performance_data = {
                 'cpu_usage': game_info['cpu_usage'],
-                'memory_usage_mb': game_info['memory_usage_mb'],
-                'timestamp': datetime.now().isoformat()
+                'memory_usage_mb': game_info['memory_usage_mb']
             }
             self.session_manager.update_session(existing_session, performance_data)
     
-    def _store_achievements(self, achievements: List[GameAchievement]):
-        """Store achievements in database"""
-        try:
-            conn = sqlite3.connect(GAME_TRACKER_ACHIEVEMENTS_DB)
-            cursor = conn.cursor()
-            
-            for achievement in achievements:
-                cursor.execute('''
-                    INSERT OR REPLACE INTO achievements VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    achievement.achievement_id,
-                    achievement.game_title,
-                    achievement.achievement_name,
-                    achievement.achievement_description,
-                    achievement.unlock_timestamp.isoformat() if achievement.unlock_timestamp else None,
-                    achievement.unlock_progress,
-                    achievement.difficulty_rating,
-                    achievement.achievement_type,
-                    achievement.points_value,
-                    achievement.rarity,
-                    achievement.platform,
-                    achievement.verified
-                ))
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            logger.error(f"❌ Failed to store achievements: {e}")
-    
     def _session_management_loop(self):
         """Session management loop"""
+        last_maintenance = time.monotonic()
+        
         while self.tracking_active:
             try:
-                # Check for games that are no longer running
-                current_games = {game['game_title'] for game in self.game_detector.detect_running_games()}
-                
-                # End sessions for games that stopped
-                sessions_to_end = []
-                for session_id, session in self.session_manager.active_sessions.items():
-                    if session.game_title not in current_games:
-                        sessions_to_end.append(session_id)
-                
-                for session_id in sessions_to_end:
-                    self.session_manager.end_session(session_id, "Game process ended")
+                # Low-frequency database maintenance (sessions are ended by the detection loop)
+                if time.monotonic() - last_maintenance >= DB_MAINTENANCE_INTERVAL:
+                    self.session_manager.run_maintenance()
+                    self.achievement_tracker.run_maintenance()
+                    last_maintenance = time.monotonic()
                 
-                time.sleep(SESSION_SAVE_INTERVAL)
+                self._shutdown.wait(SESSION_SAVE_INTERVAL)
                 
             except Exception as e:
                 logger.error(f"❌ Session management loop error: {e}")
-                time.sleep(30)
+                self._shutdown.wait(30)
+    
+    def _sample_flush_loop(self):
+        """Periodically write buffered performance samples"""
+        while self.tracking_active:
+            try:
+                self._shutdown.wait(PERF_SAMPLE_FLUSH_INTERVAL)
+                self.session_manager.flush_pending_samples()
+                
+            except Exception as e:
+                logger.error(f"❌ Sample flush loop error: {e}")
+    
+    def _schedule_achievement_check(self, session_id: str, due_at: float):
+        """Queue an achievement progress check for a session at a monotonic deadline"""
+        with self._achievement_schedule_cond:
+            heapq.heappush(self._achievement_schedule, (due_at, session_id))
+            self._achievement_schedule_cond.notify()
     
     def _achievement_tracking_loop(self):
         """Achievement tracking loop"""
+        schedule = self._achievement_schedule
+        
         while self.tracking_active:
             try:
-                # Check achievement progress for active games
-                for session_id, session in self.session_manager.active_sessions.items():
-                    # In a full implementation, this would check actual achievement progress
-                    # For demo, simulate progress updates
-                    if session.duration_seconds > 0 and session.duration_seconds % 300 == 0:  # Every 5 minutes
-                        self._simulate_achievement_progress(session.game_title, session_id)
+                # Sleep until the earliest session crosses its next 5 minute boundary
+                with self._achievement_schedule_cond:
+                    while self.tracking_active:
+                        now = time.monotonic()
+                        if schedule and schedule[0][0] <= now:
+                            break
+                        self._achievement_schedule_cond.wait(schedule[0][0] - now if schedule else None)
+                    
+                    if not self.tracking_active:
+                        break
+                    due_at, session_id = heapq.heappop(schedule)
                 
-                time.sleep(ACHIEVEMENT_CHECK_INTERVAL)
+                # Sessions that ended since being scheduled simply drop out
+                session = self.session_manager.active_sessions.get(session_id)
+                if session is None:
+                    continue
+                
+                # In a full implementation, this would check actual achievement progress
+                # For demo, simulate progress updates
+                self._simulate_achievement_progress(session.game_title, session_id)
+                self._schedule_achievement_check(session_id, due_at + ACHIEVEMENT_CHECK_INTERVAL)
                 
             except Exception as e:
                 logger.error(f"❌ Achievement tracking loop error: {e}")
-                time.sleep(60)
+                self._shutdown.wait(60)
     
     def _simulate_achievement_progress(self, game_title: str, session_id: str):
         """Simulate achievement progress for demo"""
         # This would be replaced with actual achievement API calls
-        sample_achievements = [
-            ("Dedicated Player", 0.1),  # Progress by 10%
-            ("Explorer", 0.05),         # Progress by 5%
-            ("Collector", 0.02)         # Progress by 2%
-        ]
+        sample_achievements = {
+            "Dedicated Player": 0.1,  # Progress by 10%
+            "Explorer": 0.05,         # Progress by 5%
+            "Collector": 0.02         # Progress by 2%
+        }
         
-        for achievement_name, progress_increment in sample_achievements:
-            # Get current progress and add increment
-            try:
-                conn = sqlite3.connect(GAME_TRACKER_ACHIEVEMENTS_DB)
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT unlock_progress FROM achievements 
-                    WHERE game_title = ? AND achievement_name = ?
-                ''', (game_title, achievement_name))
-                
-                result = cursor.fetchone()
-                if result:
-                    current_progress = result[0]
-                    new_progress = min(current_progress + progress_increment, 1.0)
-                    
-                    self.achievement_tracker.update_achievement_progress(
-                        game_title, achievement_name, new_progress, session_id
-                    )
-                
-                conn.close()
-                
-            except Exception as e:
-                logger.error(f"❌ Failed to simulate achievement progress: {e}")
+        self.achievement_tracker.advance_achievement_progress(game_title, sample_achievements, session_id)
     
     def get_tracking_dashboard(self) -> Dict[str, Any]:
         """Get tracking dashboard data"""
@@ -1164,29 +1784,39 @@ class UniversalGameTracker:
                 'privacy_consent': self.privacy_consent_given,
                 'version': GAME_TRACKER_VERSION
             },
-            'active_sessions': [
-                {
-                    'game_title': session.game_title,
-                    'platform': session.platform,
-                    'duration_minutes': session.duration_seconds // 60,
-                    'start_time': session.start_time.strftime('%H:%M')
-                }
-                for session in self.session_manager.active_sessions.values()
-            ],
+            'active_sessions': self.session_manager.get_active_summaries(),
             'today_stats': self.session_manager.get_playtime_stats(days=1),
             'week_stats': self.session_manager.get_playtime_stats(days=7),
             'achievement_summary': self.achievement_tracker.get_achievement_summary(),
-            'recent_notifications': list(self.achievement_tracker.notification_queue)[-5:]
+            'recent_notifications': self.achievement_tracker.notification_queue.recent(5)
         }
     
+    def wait_for_shutdown(self, timeout: float) -> bool:
+        """Block until tracking stops or the timeout elapses; True if stopped"""
+        return self._shutdown.wait(timeout)
+    
     def stop_tracking(self):
         """Stop game tracking"""
         self.tracking_active = False
+        self._shutdown.set()
+        
+        # Wake the achievement loop so it can exit
+        with self._achievement_schedule_cond:
+            self._achievement_schedule_cond.notify_all()
+        
+        # Let in-flight loop iterations finish before the final session writes
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=5.0)
+        self._threads = []
         
         # End all active sessions
         for session_id in list(self.session_manager.active_sessions.keys()):
             self.session_manager.end_session(session_id, "Tracking stopped")
         
+        # Release pooled database connections (shared by both managers)
+        self._connections.close_all()
+        
         logger.info("🛑 Game tracking stopped")
 
 def main():
@@ -1226,7 +1856,7 @@ def main():
                     for notification in notifications[-2:]:
                         print(f"   {notification['title']}: {notification['message']}")
                 
-                time.sleep(30)  # Update every 30 seconds
+                tracker.wait_for_shutdown(30)  # Update every 30 seconds
         else:
             print("❌ Failed to start game tracking")
             
@@ -9,105 +9,51 @@ import sys
 import json
 import shutil
 import subprocess
-import plistlib
+from xml.sax.saxutils import escape
 from pathlib import Path
 import getpass
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-class ThorOSUserInstaller:
-    """THOR OS Alpha User Installer - SIP Safe"""
-    
-    def __init__(self):
-        self.user = getpass.getuser()
-        self.home = Path.home()
-        self.thor_root = self.home / "ThorOS"
-        self.current_dir = Path(__file__).parent
-        
-        print(f"🚀 THOR OS Alpha User Installer v1.0")
-        print(f"   Target: M4 MacBook Pro (User Space)")
-        print(f"   User: {self.user}")
-        print(f"   Install Path: {self.thor_root}")
-        print(f"=" * 50)
-        
-    def install_thor_os(self):
-        """Install THOR OS Alpha in user space"""
-        print(f"\n🔧 Installing THOR OS Alpha (User Space)...")
-        
-        installation_steps = [
-            ("Creating user directories", self._create_directories),
-            ("Installing THOR AI core", self._install_thor_core),
-            ("Setting up user services", self._setup_services),
-            ("Installing M4 optimizations", self._install_m4_optimizations),
-            ("Setting up auto-start", self._setup_auto_start),
-            ("Creating applications", self._create_applications),
-            ("Setting up security", self._setup_security),
-            ("Creating launchers", self._create_launchers),
-            ("Finalizing installation", self._finalize_installation)
-        ]
-        
-        for step_name, step_func in installation_steps:
-            print(f"   🔧 {step_name}...")
-            try:
-                success = step_func()
-                if success:
-                    print(f"   ✅ {step_name} completed")
-                else:
-                    print(f"   ❌ {step_name} failed")
-                    return False
-            except Exception as e:
-                print(f"   ❌ {step_name} failed: {e}")
-                return False
-        
-        print(f"\n🎉 THOR OS Alpha installation complete!")
-        return True
-    
-    def _create_directories(self):
-        """Create user directories"""
-        directories = [
-            self.thor_root,
-            self.thor_root / "AI",
-            self.thor_root / "Services",
-            self.thor_root / "Kernel", 
-            self.thor_root / "Applications",
-            self.thor_root / "Data",
-            self.thor_root / "Logs",
-            self.thor_root / "Config",
-            self.home / "Library" / "LaunchAgents"
-        ]
-        
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
-        
-        return True
-    
-    def _install_thor_core(self):
-        """Install THOR AI core system"""
-        core_files = [
-            'thor_ai.py',
-            'trinity_ai_system.py', 
-            'trinity_unified.py',
-            'thor_os_alpha.py',
-            'thor_m4_optimizer.py',
-            'hearthgate_reputation.py',
-            'thor_revenue_system.py'
-        ]
-        
-        for file in core_files:
-            src = self.current_dir / file
-            if src.exists():
-                dst = self.thor_root / "AI" / file
-                shutil.copy2(src, dst)
-                os.chmod(dst, 0o755)
-        
-        return True
-    
-    def _setup_services(self):
-        """Set up user services"""
-        service_script = f'''#!/usr/bin/env python3
-"""THOR OS Service Controller"""
-import sys
+# posix_spawn launches children without duplicating this process's page tables
+POSIX_SPAWN_AVAILABLE = sys.platform != 'win32' and hasattr(os, 'posix_spawnp')
+
+# The controller prints this once THOR OS is up; start_thor_os waits for it
+SERVICE_READY_MARKER = "THOR OS Alpha running"
+SERVICE_READY_TIMEOUT = 2.0  # seconds
+
+LAUNCH_AGENT_LABEL = "com.thor.os.user"
+
+# LaunchAgent plist; only the controller and log paths vary per user
+_PLIST_TEMPLATE = b'''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE plist PUBLIC "-//Apple//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd">
+<plist version="1.0">
+<dict>
+	<key>KeepAlive</key>
+	<false/>
+	<key>Label</key>
+	<string>com.thor.os.user</string>
+	<key>ProgramArguments</key>
+	<array>
+		<string>/usr/bin/python3</string>
+		<string>%b</string>
+	</array>
+	<key>RunAtLoad</key>
+	<true/>
+	<key>StandardErrorPath</key>
+	<string>%b</string>
+	<key>StandardOutPath</key>
+	<string>%b</string>
+</dict>
+</plist>
+'''
+
+# Generated scripts: a static body behind a header that defines THOR_ROOT
+_SERVICE_HEADER = '#!/usr/bin/env python3\n"""THOR OS Service Controller"""\n'
+_SERVICE_BODY = '''import sys
 import os
-sys.path.insert(0, '{self.thor_root}/AI')
+sys.path.insert(0, os.path.join(THOR_ROOT, 'AI'))
 
 try:
     from thor_os_alpha import ThorOS
@@ -121,52 +67,12 @@ except ImportError:
     print("⚠️ THOR OS modules not found")
     sys.exit(1)
 except Exception as e:
-    print(f"❌ THOR OS startup failed: {{e}}")
+    print(f"❌ THOR OS startup failed: {e}")
     sys.exit(1)
 '''
-        
-        service_path = self.thor_root / "Services" / "thor_controller.py"
-        service_path.write_text(service_script)
-        os.chmod(service_path, 0o755)
-        
-        return True
-    
-    def _install_m4_optimizations(self):
-        """Install M4-specific optimizations"""
-        src = self.current_dir / "thor_m4_optimizer.py"
-        if src.exists():
-            dst = self.thor_root / "Kernel" / "m4_optimizer.py"
-            shutil.copy2(src, dst)
-            os.chmod(dst, 0o755)
-        
-        return True
-    
-    def _setup_auto_start(self):
-        """Set up auto-start with LaunchAgent"""
-        launch_agent = {
-            'Label': 'com.thor.os.user',
-            'ProgramArguments': [
-                '/usr/bin/python3',
-                str(self.thor_root / "Services" / "thor_controller.py")
-            ],
-            'RunAtLoad': True,
-            'KeepAlive': False,
-            'StandardOutPath': str(self.thor_root / "Logs" / "thor.log"),
-            'StandardErrorPath': str(self.thor_root / "Logs" / "thor_error.log")
-        }
-        
-        plist_path = self.home / "Library" / "LaunchAgents" / "com.thor.os.user.plist"
-        
-        with open(plist_path, 'wb') as f:
-            plistlib.dump(launch_agent, f)
-        
-        return True
-    
-    def _create_applications(self):
-        """Create THOR OS applications"""
-        # Main application launcher
-        app_script = f'''#!/usr/bin/env python3
-"""THOR OS Application"""
+
+_APP_HEADER = '#!/usr/bin/env python3\n"""THOR OS Application"""\n'
+_APP_BODY = '''import os
 import sys
 import tkinter as tk
 from tkinter import ttk
@@ -174,7 +80,13 @@ import threading
 import subprocess
 from pathlib import Path
 
-sys.path.insert(0, '{self.thor_root}/AI')
+sys.path.insert(0, os.path.join(THOR_ROOT, 'AI'))
+
+def spawn_python(script):
+    """Launch a Python script in its own process without forking the GUI process"""
+    if sys.platform != 'win32' and hasattr(os, 'posix_spawnp'):
+        return os.posix_spawnp('python3', ['python3', str(script)], os.environ)
+    return subprocess.Popen(['python3', str(script)]).pid
 
 class ThorOSApp:
     def __init__(self):
@@ -230,49 +142,43 @@ class ThorOSApp:
         self.log("💫 Welcome to DWIDOS on your M4 MacBook Pro!")
     
     def log(self, message):
-        self.status_text.insert(tk.END, f"{{message}}\\n")
+        self.status_text.insert(tk.END, f"{message}\\n")
         self.status_text.see(tk.END)
         self.root.update()
     
     def start_thor_ai(self):
         self.log("🧠 Starting THOR AI...")
         try:
-            subprocess.Popen([
-                'python3', str(Path('{self.thor_root}') / 'AI' / 'trinity_unified.py')
-            ])
+            spawn_python(Path(THOR_ROOT) / 'AI' / 'trinity_unified.py')
             self.log("✅ THOR AI started successfully")
         except Exception as e:
-            self.log(f"❌ Failed to start THOR AI: {{e}}")
+            self.log(f"❌ Failed to start THOR AI: {e}")
     
     def check_hearthgate(self):
         self.log("🛡️ Checking HEARTHGATE status...")
         try:
             result = subprocess.run([
-                'python3', str(Path('{self.thor_root}') / 'AI' / 'hearthgate_reputation.py')
+                'python3', str(Path(THOR_ROOT) / 'AI' / 'hearthgate_reputation.py')
             ], capture_output=True, text=True, timeout=10)
             self.log("✅ HEARTHGATE security active")
         except Exception as e:
-            self.log(f"⚠️ HEARTHGATE check: {{e}}")
+            self.log(f"⚠️ HEARTHGATE check: {e}")
     
     def optimize_m4(self):
         self.log("⚡ Running M4 optimizations...")
         try:
-            subprocess.Popen([
-                'python3', str(Path('{self.thor_root}') / 'Kernel' / 'm4_optimizer.py')
-            ])
+            spawn_python(Path(THOR_ROOT) / 'Kernel' / 'm4_optimizer.py')
             self.log("✅ M4 optimizations started")
         except Exception as e:
-            self.log(f"❌ M4 optimization failed: {{e}}")
+            self.log(f"❌ M4 optimization failed: {e}")
     
     def start_revenue(self):
         self.log("💰 Starting revenue system...")
         try:
-            subprocess.Popen([
-                'python3', str(Path('{self.thor_root}') / 'AI' / 'thor_revenue_system.py')
-            ])
+            spawn_python(Path(THOR_ROOT) / 'AI' / 'thor_revenue_system.py')
             self.log("✅ Revenue system started")
         except Exception as e:
-            self.log(f"❌ Revenue system failed: {{e}}")
+            self.log(f"❌ Revenue system failed: {e}")
     
     def run(self):
         self.root.mainloop()
@@ -281,10 +187,200 @@ if __name__ == "__main__":
     app = ThorOSApp()
     app.run()
 '''
+
+class ThorOSUserInstaller:
+    """THOR OS Alpha User Installer - SIP Safe"""
+    
+    def __init__(self):
+        self.user = getpass.getuser()
+        self.home = Path.home()
+        self.thor_root = self.home / "ThorOS"
+        self.launch_agents_dir = self.home / "Library" / "LaunchAgents"
+        
+        # Paths reused across install steps, built once
+        self.thor_root_str = str(self.thor_root)
+        self.service_controller = self.thor_root / "Services" / "thor_controller.py"
+        self.service_controller_str = str(self.service_controller)
+        self.service_log = self.thor_root / "Logs" / "thor.log"
+        self.service_error_log = self.thor_root / "Logs" / "thor_error.log"
+        self.launch_plist = self.launch_agents_dir / f"{LAUNCH_AGENT_LABEL}.plist"
+        self._plist_unchanged = False  # set when reinstalling an identical LaunchAgent
+        self._print_lock = threading.Lock()  # keeps concurrent step output line-atomic
+        self.current_dir = Path(__file__).parent
+        
+        # Payload files next to the installer, from one directory read
+        with os.scandir(self.current_dir) as entries:
+            self._current_files = {entry.name for entry in entries if entry.is_file()}
+        
+        print(f"🚀 THOR OS Alpha User Installer v1.0")
+        print(f"   Target: M4 MacBook Pro (User Space)")
+        print(f"   User: {self.user}")
+        print(f"   Install Path: {self.thor_root}")
+        print(f"=" * 50)
+        
+    def install_thor_os(self):
+        """Install THOR OS Alpha in user space"""
+        print(f"\n🔧 Installing THOR OS Alpha (User Space)...")
+        
+        # Every step after the directories only writes its own files, so
+        # they run concurrently; finalizing reads what auto-start decided
+        phases = [
+            [("Creating user directories", self._create_directories)],
+            [
+                ("Installing THOR AI core", self._install_thor_core),
+                ("Setting up user services", self._setup_services),
+                ("Installing M4 optimizations", self._install_m4_optimizations),
+                ("Setting up auto-start", self._setup_auto_start),
+                ("Creating applications", self._create_applications),
+                ("Setting up security", self._setup_security),
+                ("Creating launchers", self._create_launchers)
+            ],
+            [("Finalizing installation", self._finalize_installation)]
+        ]
+        
+        for steps in phases:
+            if len(steps) == 1:
+                results = [self._run_step(*steps[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    results = list(executor.map(lambda step: self._run_step(*step), steps))
+            
+            if not all(results):
+                return False
+        
+        print(f"\n🎉 THOR OS Alpha installation complete!")
+        return True
+    
+    def _run_step(self, step_name, step_func):
+        """Run one installation step, reporting its status"""
+        with self._print_lock:
+            print(f"   🔧 {step_name}...")
+        try:
+            success = step_func()
+        except Exception as e:
+            with self._print_lock:
+                print(f"   ❌ {step_name} failed: {e}")
+            return False
+        
+        with self._print_lock:
+            if success:
+                print(f"   ✅ {step_name} completed")
+            else:
+                print(f"   ❌ {step_name} failed")
+        return bool(success)
+    
+    def _create_directories(self):
+        """Create user directories"""
+        directories = [
+            self.thor_root,
+            self.thor_root / "AI",
+            self.thor_root / "Services",
+            self.thor_root / "Kernel", 
+            self.thor_root / "Applications",
+            self.thor_root / "Data",
+            self.thor_root / "Logs",
+            self.thor_root / "Config",
+            self.launch_agents_dir
+        ]
+        
+        # Parents first, so each directory needs a single mkdir
+        directories.sort(key=lambda directory: len(directory.parts))
+        
+        for directory in directories:
+            try:
+                os.mkdir(directory)
+            except FileExistsError:
+                pass
+            except FileNotFoundError:
+                # Ancestor outside the install tree is missing (e.g. ~/Library)
+                os.makedirs(directory, exist_ok=True)
+        
+        return True
+    
+    def _install_thor_core(self):
+        """Install THOR AI core system"""
+        core_files = [
+            'thor_ai.py',
+            'trinity_ai_system.py', 
+            'trinity_unified.py',
+            'thor_os_alpha.py',
+            'thor_m4_optimizer.py',
+            'hearthgate_reputation.py',
+            'thor_revenue_system.py'
+        ]
+        
+        copies = [
+            (self.current_dir / file, self.thor_root / "AI" / file)
+            for file in core_files
+            if file in self._current_files
+        ]
+        self._copy_executables(copies)
+        
+        return True
+    
+    def _copy_executables(self, copies):
+        """Copy (src, dst) pairs concurrently and mark them executable"""
+        if not copies:
+            return
+        
+        def copy_one(pair):
+            src, dst = pair
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                # Set the mode on the open descriptor rather than resolving dst again by path
+                os.fchmod(fdst.fileno(), 0o755)
+                shutil.copyfileobj(fsrc, fdst)
+        
+        with ThreadPoolExecutor(max_workers=min(os.cpu_count() or 4, len(copies))) as executor:
+            # list() re-raises the first copy failure in the calling step
+            list(executor.map(copy_one, copies))
+    
+    def _setup_services(self):
+        """Set up user services"""
+        self._write_files([
+            (self.service_controller, self._render_script(_SERVICE_HEADER, _SERVICE_BODY), 0o755)
+        ])
         
-        app_path = self.thor_root / "Applications" / "ThorOS.py"
-        app_path.write_text(app_script)
-        os.chmod(app_path, 0o755)
+        return True
+    
+    def _render_script(self, header, body):
+        """Join a generated script's header, THOR_ROOT constant and static body"""
+        # json.dumps yields a valid Python string literal with quotes and backslashes escaped
+        return f"{header}THOR_ROOT = {json.dumps(self.thor_root_str)}\n\n{body}".encode()
+    
+    def _install_m4_optimizations(self):
+        """Install M4-specific optimizations"""
+        if "thor_m4_optimizer.py" in self._current_files:
+            self._copy_executables([
+                (self.current_dir / "thor_m4_optimizer.py", self.thor_root / "Kernel" / "m4_optimizer.py")
+            ])
+        
+        return True
+    
+    def _setup_auto_start(self):
+        """Set up auto-start with LaunchAgent"""
+        plist_path = self.launch_plist
+        plist_bytes = _PLIST_TEMPLATE % tuple(
+            escape(path).encode()
+            for path in (self.service_controller_str, str(self.service_error_log), str(self.service_log))
+        )
+        
+        # Leave an identical agent file alone; loading is checked separately
+        try:
+            self._plist_unchanged = plist_path.read_bytes() == plist_bytes
+        except FileNotFoundError:
+            self._plist_unchanged = False
+        
+        if not self._plist_unchanged:
+            self._write_files([(plist_path, plist_bytes, 0o644)])
+        
+        return True
+    
+    def _create_applications(self):
+        """Create THOR OS applications"""
+        # Main application launcher
+        self._write_files([
+            (self.thor_root / "Applications" / "ThorOS.py", self._render_script(_APP_HEADER, _APP_BODY), 0o755)
+        ])
         
         return True
     
@@ -296,35 +392,49 @@ if __name__ == "__main__":
             'access_logging': True,
             'encryption_enabled': True,
             'user_install': True,
-            'install_path': str(self.thor_root)
+            'install_path': self.thor_root_str
         }
         
-        config_path = self.thor_root / "Config" / "security.json"
-        config_path.write_text(json.dumps(security_config, indent=2))
+        self._write_files([
+            (self.thor_root / "Config" / "security.json", json.dumps(security_config, indent=2).encode(), 0o644)
+        ])
         
         return True
     
+    def _write_files(self, writes):
+        """Write (path, data, mode) entries through raw file descriptors"""
+        for path, data, mode in writes:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+            try:
+                os.write(fd, data)
+                # The open mode only applies to new files and is masked by umask
+                os.fchmod(fd, mode)
+            finally:
+                os.close(fd)
+    
     def _create_launchers(self):
         """Create command-line launchers"""
         # Create thor-ai command
         thor_launcher = f'''#!/bin/bash
 # THOR AI Launcher
-cd "{self.thor_root}/AI"
+cd "{self.thor_root_str}/AI"
 python3 trinity_unified.py "$@"
 '''
         
         launcher_path = self.thor_root / "thor-ai"
-        launcher_path.write_text(thor_launcher)
-        os.chmod(launcher_path, 0o755)
+        self._write_files([(launcher_path, thor_launcher.encode(), 0o755)])
         
         # Create symlink in user bin (if exists)
         user_bin = self.home / ".local" / "bin"
         if user_bin.exists():
             try:
                 symlink_path = user_bin / "thor-ai"
-                if symlink_path.exists():
-                    symlink_path.unlink()
-                symlink_path.symlink_to(launcher_path)
+                # unlink also removes a dangling link, which exists() would miss
+                try:
+                    os.unlink(symlink_path)
+                except FileNotFoundError:
+                    pass
+                os.symlink(launcher_path, symlink_path)
             except:
                 pass  # Ignore symlink failures
         
@@ -338,41 +448,66 @@ python3 trinity_unified.py "$@"
             'installation_date': time.strftime('%Y-%m-%d %H:%M:%S'),
             'version': 'Alpha 1.0 User',
             'user': self.user,
-            'install_path': str(self.thor_root),
+            'install_path': self.thor_root_str,
             'auto_start': True
         }
         
-        config_path = self.thor_root / "Config" / "user_config.json"
-        config_path.write_text(json.dumps(user_config, indent=2))
+        self._write_files([
+            (self.thor_root / "Config" / "user_config.json", json.dumps(user_config, indent=2).encode(), 0o644)
+        ])
         
-        # Load LaunchAgent
-        try:
-            subprocess.run([
-                'launchctl', 'load', 
-                str(self.home / "Library" / "LaunchAgents" / "com.thor.os.user.plist")
-            ], check=True)
+        # Load LaunchAgent unless launchd already has it, even if the file was unchanged
+        if self._plist_unchanged and self._launchctl('list', LAUNCH_AGENT_LABEL, quiet=True):
+            print("   ✅ Auto-start already configured")
+            return True
+        
+        if self._launchctl('load', str(self.launch_plist)):
             print("   ✅ Auto-start configured")
-        except subprocess.CalledProcessError:
+        else:
             print("   ⚠️ Auto-start will activate on next login")
         
         return True
     
+    def _launchctl(self, *args, quiet=False):
+        """Run launchctl and report whether it succeeded"""
+        launchctl_args = ['launchctl', *args]
+        
+        if POSIX_SPAWN_AVAILABLE:
+            file_actions = [(os.POSIX_SPAWN_OPEN, fd, os.devnull, os.O_WRONLY, 0) for fd in (1, 2)] if quiet else []
+            pid = os.posix_spawnp('launchctl', launchctl_args, os.environ, file_actions=file_actions)
+            _, status = os.waitpid(pid, 0)
+            return os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        
+        output = subprocess.DEVNULL if quiet else None
+        return subprocess.run(launchctl_args, stdout=output, stderr=output).returncode == 0
+    
     def start_thor_os(self):
         """Start THOR OS immediately"""
         print(f"\n🚀 Starting THOR OS Alpha...")
         
         try:
-            # Start the main service
-            service_path = self.thor_root / "Services" / "thor_controller.py"
+            # Start the main service, unbuffered so the ready marker reaches the log immediately
+            env = dict(os.environ, PYTHONUNBUFFERED="1")
+            log_offset = self.service_log.stat().st_size if self.service_log.exists() else 0
             
-            process = subprocess.Popen([
-                'python3', str(service_path)
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            if POSIX_SPAWN_AVAILABLE:
+                # Send output to the service logs instead of pipes nobody reads
+                log_flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+                pid = os.posix_spawnp('python3', ['python3', self.service_controller_str], env, file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 1, str(self.service_log), log_flags, 0o644),
+                    (os.POSIX_SPAWN_OPEN, 2, str(self.service_error_log), log_flags, 0o644)
+                ])
+                has_exited = lambda: os.waitpid(pid, os.WNOHANG) != (0, 0)
+            else:
+                with open(self.service_log, 'ab') as stdout, open(self.service_error_log, 'ab') as stderr:
+                    process = subprocess.Popen([
+                        'python3', self.service_controller_str
+                    ], stdout=stdout, stderr=stderr, env=env)
+                has_exited = lambda: process.poll() is not None
             
-            # Give it a moment to start
-            time.sleep(2)
+            running = self._wait_for_service_ready(log_offset, has_exited)
             
-            if process.poll() is None:
+            if running:
                 print(f"✅ THOR OS Alpha is running!")
                 return True
             else:
@@ -382,6 +517,25 @@ python3 trinity_unified.py "$@"
         except Exception as e:
             print(f"❌ Failed to start THOR OS: {e}")
             return False
+    
+    def _wait_for_service_ready(self, log_offset, has_exited):
+        """Watch the service log for the ready marker; False if the service exits first"""
+        marker = SERVICE_READY_MARKER.encode()
+        deadline = time.monotonic() + SERVICE_READY_TIMEOUT
+        output = b''
+        
+        with open(self.service_log, 'a+b') as log:
+            log.seek(log_offset)
+            while time.monotonic() < deadline:
+                output += log.read()
+                if marker in output:
+                    return True
+                if has_exited():
+                    return False
+                time.sleep(0.05)
+        
+        # Still starting after the timeout counts as running, as before
+        return not has_exited()
 
 def main():
     """Main installation function"""
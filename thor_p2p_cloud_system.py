@@ -14,8 +14,12 @@ Created as part of THOR-OS "ONE MAN ARMY" Ultimate Implementation
 """
 
 import asyncio
+import os
+import sys
 import json
+import shutil
 import socket
+import tempfile
 import hashlib
 import logging
 import platform
@@ -27,21 +31,187 @@ import websockets
 import ssl
 from dataclasses import dataclass, asdict
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, x25519
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.backends import default_backend
 import base64
 import uuid
 import zlib
 import time
+from functools import lru_cache
+from concurrent.futures import Executor, ThreadPoolExecutor
 
-@dataclass
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import msgspec
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Inbound signatures are verified in batches per peer connection
+SIGNATURE_BATCH_SIZE = 32
+SIGNATURE_BATCH_WINDOW = 0.005  # seconds to wait for more messages before verifying
+SIGNATURE_SIZE = 64  # raw Ed25519 signature prefixed to each message frame
+
+# Shared files are hashed and encrypted in chunks of this size
+FILE_CHUNK_SIZE = 1 << 20
+DECRYPT_SPOOL_SIZE = 8 * FILE_CHUNK_SIZE  # verified plaintext held in memory before spilling to disk
+GCM_NONCE_SIZE = 12
+GCM_TAG_SIZE = 16
+AES_BLOCK_SIZE = 16
+
+# Node keypairs (raw Ed25519 || X25519 private bytes) persisted under the data dir
+NODE_KEY_FILE = 'node.key'
+
+# Private files are compressed before encryption when a sample of them compresses well
+COMPRESSION_SAMPLE_SIZE = 4096
+COMPRESSION_MAX_RATIO = 0.8
+
+# Content hash for shared files, recorded as "<alg>:<hex>" so peers can tell them apart
+FILE_HASH_ALG = 'blake3' if BLAKE3_AVAILABLE else 'sha256'
+
+# Discovered peers not heard from for this long are dropped
+PEER_STALE_AFTER = timedelta(minutes=5)
+
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# msgspec's reusable encoder/decoder emit standard MessagePack, so peers using
+# the msgpack package read it unchanged
+if MSGSPEC_AVAILABLE:
+    _MSGPACK_ENCODER = msgspec.msgpack.Encoder(enc_hook=str)
+    _MSGPACK_DECODER = msgspec.msgpack.Decoder()
+
+def _pack_message(message_fields: List[Any]) -> bytes:
+    """Encode message fields for the wire as MessagePack, or JSON without msgpack"""
+    if MSGSPEC_AVAILABLE:
+        return _MSGPACK_ENCODER.encode(message_fields)
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(message_fields, default=str, use_bin_type=True)
+    return json.dumps(message_fields, default=str).encode('utf-8')
+
+def _unpack_message(data: bytes) -> List[Any]:
+    """Decode message fields from either encoding"""
+    # A JSON array always starts with '['; a MessagePack array never does
+    if data[:1] == b'[':
+        return json.loads(data)
+    if MSGSPEC_AVAILABLE:
+        return _MSGPACK_DECODER.decode(data)
+    if not MSGPACK_AVAILABLE:
+        raise ValueError("MessagePack frame received but msgpack is not installed")
+    return msgpack.unpackb(data, raw=False)
+
+def _new_file_hasher():
+    """Empty FILE_HASH_ALG hasher for content fed chunk by chunk"""
+    return blake3.blake3() if BLAKE3_AVAILABLE else hashlib.sha256()
+
+def _choose_compression(sample: bytes) -> Optional[str]:
+    """Compression for a file whose first bytes are sample, or None if not worth it"""
+    if sample and len(zlib.compress(sample, 1)) <= len(sample) * COMPRESSION_MAX_RATIO:
+        return 'zstd' if ZSTD_AVAILABLE else 'zlib'
+    return None
+
+def _new_compressor(compression: Optional[str]):
+    """Streaming compressor with compress()/flush() for a FileShare.compression value"""
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor(level=3).compressobj()
+    if compression == 'zlib':
+        return zlib.compressobj(6)
+    return None
+
+def _decompress_into(compression: Optional[str], source, output):
+    """Decompress source into output, never holding more than a chunk of plaintext in memory"""
+    if compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise ValueError("File is zstd-compressed but zstandard is not installed")
+        with zstandard.ZstdDecompressor().stream_reader(source, closefd=False) as reader:
+            shutil.copyfileobj(reader, output, FILE_CHUNK_SIZE)
+        return
+    
+    if compression != 'zlib':
+        shutil.copyfileobj(source, output, FILE_CHUNK_SIZE)
+        return
+    
+    decompressor = zlib.decompressobj()
+    while True:
+        data = source.read(FILE_CHUNK_SIZE)
+        if not data:
+            break
+        # max_length bounds each step; the rest of the input waits in unconsumed_tail
+        while data:
+            output.write(decompressor.decompress(data, FILE_CHUNK_SIZE))
+            data = decompressor.unconsumed_tail
+    output.write(decompressor.flush())
+
+def _cipher_into(cipher_ctx, data, buffer: bytearray, output):
+    """Run data through cipher_ctx into a reused buffer and write the result to output"""
+    # update_into needs up to a block of slack beyond its input
+    step = len(buffer) - (AES_BLOCK_SIZE - 1)
+    view = memoryview(data)
+    for start in range(0, len(view), step):
+        written = cipher_ctx.update_into(view[start:start + step], buffer)
+        output.write(memoryview(buffer)[:written])
+
+def _hash_file(file_path: Path):
+    """FILE_HASH_ALG hasher over a whole file, read outside the Python loop where possible"""
+    if BLAKE3_AVAILABLE:
+        # Memory-mapped and hashed on several threads for large files
+        hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+        hasher.update_mmap(file_path)
+        return hasher
+    
+    with open(file_path, 'rb') as source:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(source, 'sha256')
+        
+        hasher = hashlib.sha256()
+        while chunk := source.read(FILE_CHUNK_SIZE):
+            hasher.update(chunk)
+        return hasher
+
+@lru_cache(maxsize=1024)
+def _load_public_key(public_key: str) -> ed25519.Ed25519PublicKey:
+    """Parse a peer's base64 raw Ed25519 key once per distinct key"""
+    return ed25519.Ed25519PublicKey.from_public_bytes(base64.b64decode(public_key))
+
+@dataclass(**_DATACLASS_OPTIONS)
 class THORPeerNode:
     """Represents a THOR peer node in the network"""
     node_id: str
     address: str
     port: int
-    public_key_pem: str
+    public_key: str  # base64 raw Ed25519 key
     capabilities: List[str]
     node_type: str  # 'full', 'light', 'bridge'
     last_seen: datetime
@@ -49,8 +219,9 @@ class THORPeerNode:
     shared_repos: List[str]
     bandwidth_limit: int  # KB/s
     storage_available: int  # MB
+    exchange_key: str = ''  # base64 raw X25519 key, learned at handshake
     
-@dataclass 
+@dataclass(**_DATACLASS_OPTIONS)
 class P2PMessage:
     """Represents a P2P network message"""
     message_id: str
@@ -60,8 +231,14 @@ class P2PMessage:
     payload: Dict[str, Any]
     timestamp: datetime
     signature: Optional[str] = None
+    
+    def wire_fields(self) -> List[Any]:
+        """Signed fields in declaration order, without asdict's recursive copy"""
+        # The timestamp goes out as str() under every encoder, as received messages carry it
+        return [self.message_id, self.sender_id, self.receiver_id,
+                self.message_type, self.payload, str(self.timestamp)]
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class FileShare:
     """Represents a shared file in the P2P network"""
     file_id: str
@@ -72,126 +249,176 @@ class FileShare:
     access_level: str  # 'public', 'private', 'team'
     encryption_key: Optional[str] = None
     created_at: datetime = None
+    compression: Optional[str] = None  # 'zstd' or 'zlib' when compressed before encryption
 
 class THORCrypto:
     """Cryptographic utilities for THOR P2P network"""
     
-    def __init__(self):
+    def __init__(self, key_dir: Optional[Path] = None):
         self.private_key = None
         self.public_key = None
+        self.exchange_private_key = None
+        self.exchange_public_key = None
+        self.key_path = Path(key_dir) / NODE_KEY_FILE if key_dir else None
         self._generate_keypair()
     
     def _generate_keypair(self):
-        """Generate RSA keypair for node"""
-        self.private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
+        """Load Ed25519 signing and X25519 key-exchange keypairs, generating them on first run"""
+        if not self._load_keypair():
+            self.private_key = ed25519.Ed25519PrivateKey.generate()
+            self.exchange_private_key = x25519.X25519PrivateKey.generate()
+            self._save_keypair()
+        
         self.public_key = self.private_key.public_key()
+        self.exchange_public_key = self.exchange_private_key.public_key()
     
-    def get_public_key_pem(self) -> str:
-        """Get public key in PEM format"""
-        pem = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
+    def _load_keypair(self) -> bool:
+        """Load persisted private keys from key_path, if there are any"""
+        if self.key_path is None:
+            return False
+        
+        try:
+            raw = self.key_path.read_bytes()
+        except FileNotFoundError:
+            return False
+        
+        if len(raw) != 64:
+            raise ValueError(f"Corrupt node key file: {self.key_path}")
+        
+        self.private_key = ed25519.Ed25519PrivateKey.from_private_bytes(raw[:32])
+        self.exchange_private_key = x25519.X25519PrivateKey.from_private_bytes(raw[32:])
+        return True
+    
+    def _save_keypair(self):
+        """Persist private keys to key_path, owner-only and atomically replaced"""
+        if self.key_path is None:
+            return
+        
+        raw = b''.join(
+            key.private_bytes(
+                encoding=serialization.Encoding.Raw,
+                format=serialization.PrivateFormat.Raw,
+                encryption_algorithm=serialization.NoEncryption()
+            )
+            for key in (self.private_key, self.exchange_private_key)
         )
-        return pem.decode('utf-8')
-    
-    def sign_message(self, message: str) -> str:
-        """Sign a message with private key"""
-        signature = self.private_key.sign(
-            message.encode('utf-8'),
-            padding.PSS(
-                mgf=padding.MGF1(hashes.SHA256()),
-                salt_length=padding.PSS.MAX_LENGTH
-            ),
-            hashes.SHA256()
+        
+        tmp_path = self.key_path.with_suffix('.tmp')
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.write(fd, raw)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, self.key_path)
+    
+    def get_public_key(self) -> str:
+        """Get signing public key as base64 of its raw 32 bytes"""
+        raw = self.public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
+        )
+        return base64.b64encode(raw).decode('utf-8')
+    
+    def get_exchange_key(self) -> str:
+        """Get key-exchange public key as base64 of its raw 32 bytes"""
+        raw = self.exchange_public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
         )
-        return base64.b64encode(signature).decode('utf-8')
+        return base64.b64encode(raw).decode('utf-8')
     
-    def verify_signature(self, message: str, signature: str, public_key_pem: str) -> bool:
+    def sign_bytes(self, message: bytes) -> bytes:
+        """Sign message bytes with private key, returning the raw signature"""
+        return self.private_key.sign(message)
+    
+    def sign_message(self, message: bytes) -> str:
+        """Sign message bytes with private key"""
+        return base64.b64encode(self.sign_bytes(message)).decode('utf-8')
+    
+    def verify_signature(self, message: bytes, signature: str, public_key: str) -> bool:
         """Verify message signature"""
         try:
-            public_key = serialization.load_pem_public_key(
-                public_key_pem.encode('utf-8'),
-                backend=default_backend()
-            )
-            
-            signature_bytes = base64.b64decode(signature)
-            
-            public_key.verify(
-                signature_bytes,
-                message.encode('utf-8'),
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.MAX_LENGTH
-                ),
-                hashes.SHA256()
-            )
+            peer_key = _load_public_key(public_key)
+            peer_key.verify(base64.b64decode(signature), message)
             return True
         except Exception:
             return False
     
-    def encrypt_data(self, data: bytes, public_key_pem: str) -> bytes:
-        """Encrypt data with public key"""
-        public_key = serialization.load_pem_public_key(
-            public_key_pem.encode('utf-8'),
-            backend=default_backend()
-        )
-        
-        # Generate AES key for actual encryption
-        aes_key = os.urandom(32)
-        iv = os.urandom(16)
+    def verify_batch(self, items: List[Tuple[bytes, bytes]], public_key: str) -> List[bool]:
+        """Verify (message, raw signature) pairs from one signer, one result per pair"""
+        try:
+            peer_key = _load_public_key(public_key)
+        except Exception:
+            return [False] * len(items)
         
-        # Encrypt data with AES
-        cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv), backend=default_backend())
-        encryptor = cipher.encryptor()
+        results = []
+        for message, signature in items:
+            try:
+                peer_key.verify(signature, message)
+                results.append(True)
+            except Exception:
+                results.append(False)
+        return results
+    
+    @staticmethod
+    def _derive_aes_key(shared_secret: bytes) -> bytes:
+        """Derive the AES-256 key from an X25519 shared secret"""
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b'thor-p2p-ecies',
+            backend=default_backend()
+        ).derive(shared_secret)
+    
+    def encrypt_data(self, data: bytes, exchange_key: str) -> bytes:
+        """Encrypt data for the holder of an X25519 exchange key"""
+        peer_key = x25519.X25519PublicKey.from_public_bytes(base64.b64decode(exchange_key))
         
-        # Pad data to AES block size
-        padding_length = 16 - (len(data) % 16)
-        padded_data = data + bytes([padding_length] * padding_length)
+        # Ephemeral key agreement yields the AES key (ECIES)
+        ephemeral_key = x25519.X25519PrivateKey.generate()
+        aes_key = self._derive_aes_key(ephemeral_key.exchange(peer_key))
+        nonce = os.urandom(12)
         
-        encrypted_data = encryptor.update(padded_data) + encryptor.finalize()
+        # Encrypt and authenticate data with AES-GCM
+        encrypted_data = AESGCM(aes_key).encrypt(nonce, data, None)
         
-        # Encrypt AES key with RSA
-        encrypted_key = public_key.encrypt(
-            aes_key,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None
-            )
+        ephemeral_public = ephemeral_key.public_key().public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
         )
         
-        # Combine encrypted key, IV, and data
-        return encrypted_key + iv + encrypted_data
+        # Combine ephemeral public key, nonce, and data with tag
+        return ephemeral_public + nonce + encrypted_data
     
     def decrypt_data(self, encrypted_data: bytes) -> bytes:
         """Decrypt data with private key"""
         # Extract components
-        encrypted_key = encrypted_data[:256]  # RSA key size
-        iv = encrypted_data[256:272]  # IV size
-        ciphertext = encrypted_data[272:]
-        
-        # Decrypt AES key
-        aes_key = self.private_key.decrypt(
-            encrypted_key,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None
-            )
-        )
+        ephemeral_public = encrypted_data[:32]  # X25519 public key size
+        nonce = encrypted_data[32:44]  # GCM nonce size
+        ciphertext = encrypted_data[44:]
         
-        # Decrypt data
-        cipher = Cipher(algorithms.AES(aes_key), modes.CBC(iv), backend=default_backend())
-        decryptor = cipher.decryptor()
-        padded_data = decryptor.update(ciphertext) + decryptor.finalize()
+        # Recover AES key
+        aes_key = self._derive_aes_key(
+            self.exchange_private_key.exchange(x25519.X25519PublicKey.from_public_bytes(ephemeral_public))
+        )
         
-        # Remove padding
-        padding_length = padded_data[-1]
-        return padded_data[:-padding_length]
+        # Decrypt data, rejecting it if the tag does not match
+        return AESGCM(aes_key).decrypt(nonce, ciphertext, None)
+
+class _DiscoveryProtocol(asyncio.DatagramProtocol):
+    """Hands discovery datagrams to THORPeerDiscovery as the loop receives them"""
+    
+    def __init__(self, discovery: 'THORPeerDiscovery'):
+        self.discovery = discovery
+    
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]):
+        if self.discovery.discovery_active:
+            self.discovery._handle_discovery_message(data, addr)
+    
+    def error_received(self, exc: Exception):
+        self.discovery.logger.error(f"UDP discovery error: {str(exc)}")
 
 class THORPeerDiscovery:
     """Peer discovery service for THOR P2P network"""
@@ -199,8 +426,9 @@ class THORPeerDiscovery:
     def __init__(self, node_id: str, port: int = 8888):
         self.node_id = node_id
         self.port = port
-        self.discovered_peers: Dict[str, THORPeerNode] = {}
+        self.discovered_peers: Dict[str, THORPeerNode] = {}  # oldest last_seen first
         self.discovery_active = False
+        self._transport: Optional[asyncio.DatagramTransport] = None
         self.logger = logging.getLogger('thor_peer_discovery')
         
     async def start_discovery(self):
@@ -220,22 +448,20 @@ class THORPeerDiscovery:
     
     async def _udp_discovery_listener(self):
         """Listen for UDP discovery broadcasts"""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.bind(('', self.port))
-        
-        while self.discovery_active:
-            try:
-                data, addr = sock.recvfrom(1024)
-                await self._handle_discovery_message(data, addr)
-            except Exception as e:
-                self.logger.error(f"UDP discovery error: {str(e)}")
-                await asyncio.sleep(1)
+        try:
+            # SO_REUSEPORT lets several node processes share the discovery port
+            self._transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: _DiscoveryProtocol(self),
+                local_addr=('0.0.0.0', self.port),
+                reuse_port=hasattr(socket, 'SO_REUSEPORT')
+            )
+        except Exception as e:
+            self.logger.error(f"UDP discovery error: {str(e)}")
     
-    async def _handle_discovery_message(self, data: bytes, addr: Tuple[str, int]):
+    def _handle_discovery_message(self, data: bytes, addr: Tuple[str, int]):
         """Handle incoming discovery message"""
         try:
-            message = json.loads(data.decode('utf-8'))
+            message = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
             
             if message.get('type') == 'thor_peer_announce':
                 peer_info = message.get('peer_info')
@@ -245,7 +471,7 @@ class THORPeerDiscovery:
                         node_id=peer_info['node_id'],
                         address=addr[0],
                         port=peer_info.get('port', 8889),
-                        public_key_pem=peer_info.get('public_key', ''),
+                        public_key=peer_info.get('public_key', ''),
                         capabilities=peer_info.get('capabilities', []),
                         node_type=peer_info.get('node_type', 'light'),
                         last_seen=datetime.now(),
@@ -255,6 +481,8 @@ class THORPeerDiscovery:
                         storage_available=peer_info.get('storage_available', 1000)
                     )
                     
+                    # Re-insert so the dict stays ordered by last_seen
+                    self.discovered_peers.pop(peer.node_id, None)
                     self.discovered_peers[peer.node_id] = peer
                     self.logger.info(f"Discovered THOR peer: {peer.node_id} at {addr[0]}")
         
@@ -266,23 +494,23 @@ class THORPeerDiscovery:
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         
+        # Create announcement message; nothing in it changes between broadcasts
+        announcement = {
+            'type': 'thor_peer_announce',
+            'peer_info': {
+                'node_id': self.node_id,
+                'port': self.port + 1,  # Data port
+                'capabilities': ['sync', 'storage', 'relay'],
+                'node_type': 'full',
+                'shared_repos': [],
+                'bandwidth_limit': 10000,
+                'storage_available': 50000
+            }
+        }
+        message = orjson.dumps(announcement) if ORJSON_AVAILABLE else json.dumps(announcement).encode('utf-8')
+        
         while self.discovery_active:
             try:
-                # Create announcement message
-                announcement = {
-                    'type': 'thor_peer_announce',
-                    'peer_info': {
-                        'node_id': self.node_id,
-                        'port': self.port + 1,  # Data port
-                        'capabilities': ['sync', 'storage', 'relay'],
-                        'node_type': 'full',
-                        'shared_repos': [],
-                        'bandwidth_limit': 10000,
-                        'storage_available': 50000
-                    }
-                }
-                
-                message = json.dumps(announcement).encode('utf-8')
                 sock.sendto(message, ('<broadcast>', self.port))
                 
                 await asyncio.sleep(30)  # Broadcast every 30 seconds
@@ -309,27 +537,32 @@ class THORPeerDiscovery:
     
     def get_discovered_peers(self) -> List[THORPeerNode]:
         """Get list of discovered peers"""
-        # Remove stale peers (not seen in 5 minutes)
-        current_time = datetime.now()
-        stale_peers = [
-            node_id for node_id, peer in self.discovered_peers.items()
-            if current_time - peer.last_seen > timedelta(minutes=5)
-        ]
+        # Remove stale peers; they are all at the front, so stop at the first fresh one
+        cutoff = datetime.now() - PEER_STALE_AFTER
+        stale_peers = []
+        for node_id, peer in self.discovered_peers.items():
+            if peer.last_seen >= cutoff:
+                break
+            stale_peers.append(node_id)
         
         for node_id in stale_peers:
             del self.discovered_peers[node_id]
         
         return list(self.discovered_peers.values())
+    
+    def get_peer_count(self) -> int:
+        """Number of discovered peers, without pruning stale ones"""
+        return len(self.discovered_peers)
 
 class THORPeerConnection:
     """Manages connection to a THOR peer"""
     
-    def __init__(self, peer: THORPeerNode, crypto: THORCrypto):
+    def __init__(self, peer: THORPeerNode, crypto: THORCrypto, inbox: asyncio.Queue):
         self.peer = peer
         self.crypto = crypto
         self.websocket = None
         self.connected = False
-        self.message_queue = asyncio.Queue()
+        self.inbox = inbox  # shared by all connections, drained by THORPeerToPeer
         self.logger = logging.getLogger('thor_peer_connection')
     
     async def connect(self) -> bool:
@@ -360,7 +593,8 @@ class THORPeerConnection:
             receiver_id=self.peer.node_id,
             message_type='handshake',
             payload={
-                'public_key': self.crypto.get_public_key_pem(),
+                'public_key': self.crypto.get_public_key(),
+                'exchange_key': self.crypto.get_exchange_key(),
                 'capabilities': ['sync', 'storage', 'relay'],
                 'protocol_version': '1.0'
             },
@@ -374,49 +608,73 @@ class THORPeerConnection:
         if not self.connected or not self.websocket:
             raise Exception("Not connected to peer")
         
-        # Sign the message
-        message_data = json.dumps(asdict(message), default=str)
-        message.signature = self.crypto.sign_message(message_data)
+        # Encode once and sign those exact bytes
+        payload = _pack_message(message.wire_fields())
+        signature = self.crypto.sign_bytes(payload)
+        message.signature = base64.b64encode(signature).decode('utf-8')
         
-        # Send message
-        signed_data = json.dumps(asdict(message), default=str)
-        await self.websocket.send(signed_data)
+        # Send message (frame: signature || payload)
+        await self.websocket.send(signature + payload)
     
     async def _message_handler(self):
         """Handle incoming messages from peer"""
+        pending: List[Tuple[bytes, bytes]] = []
         try:
-            async for message_data in self.websocket:
+            while True:
                 try:
-                    message_dict = json.loads(message_data)
-                    message = P2PMessage(**message_dict)
-                    
-                    # Verify signature
-                    message_without_sig = message_dict.copy()
-                    del message_without_sig['signature']
-                    message_content = json.dumps(message_without_sig, default=str)
-                    
-                    if self.crypto.verify_signature(
-                        message_content, 
-                        message.signature, 
-                        self.peer.public_key_pem
-                    ):
-                        await self.message_queue.put(message)
-                    else:
-                        self.logger.warning(f"Invalid signature from peer {self.peer.node_id}")
+                    # Block for the first message of a batch, then only briefly for more
+                    timeout = SIGNATURE_BATCH_WINDOW if pending else None
+                    frame = await asyncio.wait_for(self.websocket.recv(), timeout)
+                except asyncio.TimeoutError:
+                    await self._verify_pending(pending)
+                    pending = []
+                    continue
+                
+                # Payloads are decoded only once their signature checks out
+                if isinstance(frame, bytes) and len(frame) > SIGNATURE_SIZE:
+                    pending.append((frame[SIGNATURE_SIZE:], frame[:SIGNATURE_SIZE]))
+                else:
+                    self.logger.error(f"Malformed message frame from peer {self.peer.node_id}")
                 
-                except Exception as e:
-                    self.logger.error(f"Failed to handle message: {str(e)}")
+                if len(pending) >= SIGNATURE_BATCH_SIZE:
+                    await self._verify_pending(pending)
+                    pending = []
         
         except websockets.exceptions.ConnectionClosed:
+            # Deliver whatever arrived before the close
+            await self._verify_pending(pending)
             self.connected = False
             self.logger.info(f"Connection to peer {self.peer.node_id} closed")
     
-    async def get_message(self) -> Optional[P2PMessage]:
-        """Get next message from peer"""
-        try:
-            return await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
-        except asyncio.TimeoutError:
-            return None
+    async def _verify_pending(self, pending: List[Tuple[bytes, bytes]]):
+        """Verify a batch of (payload, signature) frames off the event loop and queue the valid ones"""
+        if not pending:
+            return
+        
+        results = await asyncio.get_running_loop().run_in_executor(
+            None,
+            self.crypto.verify_batch,
+            pending,
+            self.peer.public_key
+        )
+        
+        for (payload, signature), valid in zip(pending, results):
+            if not valid:
+                self.logger.warning(f"Invalid signature from peer {self.peer.node_id}")
+                continue
+            
+            try:
+                message_fields = _unpack_message(payload)
+                if len(message_fields) != 6:
+                    raise ValueError(f"expected 6 message fields, got {len(message_fields)}")
+                
+                message = P2PMessage(
+                    *message_fields,
+                    signature=base64.b64encode(signature).decode('utf-8')
+                )
+                await self.inbox.put((message, self))
+            except Exception as e:
+                self.logger.error(f"Failed to handle message: {str(e)}")
     
     async def disconnect(self):
         """Disconnect from peer"""
@@ -434,23 +692,27 @@ class THORFileSharing:
         self.shared_files: Dict[str, FileShare] = {}
         self.logger = logging.getLogger('thor_file_sharing')
     
-    async def share_file(self, file_path: str, access_level: str = 'private') -> FileShare:
+    async def share_file(self, file_path: str, access_level: str = 'private',
+                         executor: Optional[Executor] = None) -> FileShare:
         """Share a file on the P2P network"""
+        # Hashing, encryption and file IO all release the GIL, so run them off the loop
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, self._share_file_sync, file_path, access_level
+        )
+    
+    def _share_file_sync(self, file_path: str, access_level: str) -> FileShare:
+        """Hash, store and register one shared file"""
         file_path = Path(file_path)
         
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        # Calculate file hash
-        file_content = file_path.read_bytes()
-        file_hash = hashlib.sha256(file_content).hexdigest()
-        
-        # Create file share object
+        # Create file share object; hash and size are filled in while streaming
         file_share = FileShare(
             file_id=str(uuid.uuid4()),
             file_name=file_path.name,
-            file_hash=file_hash,
-            file_size=len(file_content),
+            file_hash='',
+            file_size=0,
             owner_node=self.crypto.node_id,
             access_level=access_level,
             created_at=datetime.now()
@@ -462,24 +724,42 @@ class THORFileSharing:
             encryption_key = os.urandom(32)
             file_share.encryption_key = base64.b64encode(encryption_key).decode('utf-8')
             
-            # Encrypt file content
-            iv = os.urandom(16)
-            cipher = Cipher(algorithms.AES(encryption_key), modes.CBC(iv), backend=default_backend())
-            encryptor = cipher.encryptor()
-            
-            # Pad content
-            padding_length = 16 - (len(file_content) % 16)
-            padded_content = file_content + bytes([padding_length] * padding_length)
-            
-            encrypted_content = iv + encryptor.update(padded_content) + encryptor.finalize()
-            
-            # Store encrypted file
+            nonce = os.urandom(GCM_NONCE_SIZE)
+            encryptor = Cipher(algorithms.AES(encryption_key), modes.GCM(nonce), backend=default_backend()).encryptor()
             storage_path = self.storage_dir / f"{file_share.file_id}.enc"
-            storage_path.write_bytes(encrypted_content)
+            
+            # Hash, compress and encrypt in one pass (layout: nonce || ciphertext || tag)
+            hasher = _new_file_hasher()
+            # Both buffers are reused for every chunk
+            read_buffer = bytearray(FILE_CHUNK_SIZE)
+            read_view = memoryview(read_buffer)
+            cipher_buffer = bytearray(FILE_CHUNK_SIZE + AES_BLOCK_SIZE - 1)
+            with open(file_path, 'rb') as source, open(storage_path, 'wb') as stored:
+                stored.write(nonce)
+                
+                size = source.readinto(read_buffer)
+                file_share.compression = _choose_compression(read_view[:min(size, COMPRESSION_SAMPLE_SIZE)])
+                compressor = _new_compressor(file_share.compression)
+                
+                while size:
+                    chunk = read_view[:size]
+                    hasher.update(chunk)
+                    file_share.file_size += size
+                    _cipher_into(encryptor, compressor.compress(chunk) if compressor else chunk, cipher_buffer, stored)
+                    size = source.readinto(read_buffer)
+                
+                if compressor:
+                    _cipher_into(encryptor, compressor.flush(), cipher_buffer, stored)
+                encryptor.finalize()
+                stored.write(encryptor.tag)
         else:
-            # Store file as-is for public access
+            # Store file as-is for public access; the copy stays in the kernel
             storage_path = self.storage_dir / f"{file_share.file_id}.dat"
-            storage_path.write_bytes(file_content)
+            hasher = _hash_file(file_path)
+            file_share.file_size = file_path.stat().st_size
+            shutil.copyfile(file_path, storage_path)
+        
+        file_share.file_hash = f"{FILE_HASH_ALG}:{hasher.hexdigest()}"
         
         self.shared_files[file_share.file_id] = file_share
         
@@ -497,24 +777,6 @@ class THORFileSharing:
                 storage_path = self.storage_dir / f"{file_share.file_id}.dat"
             
             if storage_path.exists():
-                # Decrypt if needed
-                file_content = storage_path.read_bytes()
-                
-                if file_share.access_level == 'private' and file_share.encryption_key:
-                    # Decrypt file
-                    encryption_key = base64.b64decode(file_share.encryption_key)
-                    
-                    iv = file_content[:16]
-                    encrypted_content = file_content[16:]
-                    
-                    cipher = Cipher(algorithms.AES(encryption_key), modes.CBC(iv), backend=default_backend())
-                    decryptor = cipher.decryptor()
-                    padded_content = decryptor.update(encrypted_content) + decryptor.finalize()
-                    
-                    # Remove padding
-                    padding_length = padded_content[-1]
-                    file_content = padded_content[:-padding_length]
-                
                 # Save to download path
                 if download_path:
                     output_path = Path(download_path)
@@ -522,7 +784,24 @@ class THORFileSharing:
                     output_path = Path(f"downloads/{file_share.file_name}")
                 
                 output_path.parent.mkdir(parents=True, exist_ok=True)
-                output_path.write_bytes(file_content)
+                
+                # Decrypt if needed
+                if file_share.access_level == 'private' and file_share.encryption_key:
+                    with open(storage_path, 'rb') as stored, open(output_path, 'wb') as output:
+                        try:
+                            self._decrypt_stream(
+                                stored, output,
+                                base64.b64decode(file_share.encryption_key),
+                                file_share.compression
+                            )
+                        except Exception:
+                            # Never leave unauthenticated plaintext behind
+                            output.close()
+                            output_path.unlink()
+                            raise
+                else:
+                    # Kernel-side copy (sendfile on Linux, fcopyfile on macOS)
+                    shutil.copyfile(storage_path, output_path)
                 
                 self.logger.info(f"File downloaded: {file_share.file_name}")
                 return output_path
@@ -535,6 +814,38 @@ class THORFileSharing:
             self.logger.error(f"Failed to download file: {str(e)}")
             return None
     
+    def _decrypt_stream(self, stored, output, encryption_key: bytes, compression: Optional[str] = None):
+        """
+        Decrypt (and decompress) a nonce || ciphertext || tag file into output
+        Nothing reaches the decompressor or output until the GCM tag has been verified
+        """
+        nonce = stored.read(GCM_NONCE_SIZE)
+        stored.seek(-GCM_TAG_SIZE, os.SEEK_END)
+        tag = stored.read(GCM_TAG_SIZE)
+        remaining = stored.tell() - GCM_NONCE_SIZE - GCM_TAG_SIZE
+        stored.seek(GCM_NONCE_SIZE)
+        
+        decryptor = Cipher(algorithms.AES(encryption_key), modes.GCM(nonce, tag), backend=default_backend()).decryptor()
+        
+        with tempfile.SpooledTemporaryFile(max_size=DECRYPT_SPOOL_SIZE, dir=self.storage_dir) as plaintext:
+            # Ciphertext is read and decrypted through buffers reused for every chunk
+            read_view = memoryview(bytearray(FILE_CHUNK_SIZE))
+            plain_buffer = bytearray(FILE_CHUNK_SIZE + AES_BLOCK_SIZE - 1)
+            while remaining > 0:
+                size = stored.readinto(read_view[:min(FILE_CHUNK_SIZE, remaining)])
+                if not size:
+                    raise ValueError("Encrypted file is truncated")
+                remaining -= size
+                
+                written = decryptor.update_into(read_view[:size], plain_buffer)
+                plaintext.write(memoryview(plain_buffer)[:written])
+            
+            # Raises InvalidTag if the file was tampered with
+            decryptor.finalize()
+            
+            plaintext.seek(0)
+            _decompress_into(compression, plaintext, output)
+    
     def get_shared_files(self) -> List[FileShare]:
         """Get list of shared files"""
         return list(self.shared_files.values())
@@ -548,13 +859,16 @@ class THORPeerToPeer:
         self.data_dir.mkdir(exist_ok=True)
         
         # Initialize components
-        self.crypto = THORCrypto()
+        self.crypto = THORCrypto(self.data_dir)
         self.discovery = THORPeerDiscovery(self.node_id)
         self.file_sharing = THORFileSharing(self.crypto, str(self.data_dir / "storage"))
         
         # Peer connections
         self.connections: Dict[str, THORPeerConnection] = {}
         
+        # Verified (message, connection) pairs from every peer
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        
         # System state
         self.running = False
         self.logger = self._setup_logging()
@@ -596,7 +910,7 @@ class THORPeerToPeer:
                 # Connect to new peers
                 for peer in peers:
                     if peer.node_id not in self.connections and len(self.connections) < 10:
-                        connection = THORPeerConnection(peer, self.crypto)
+                        connection = THORPeerConnection(peer, self.crypto, self.inbox)
                         if await connection.connect():
                             self.connections[peer.node_id] = connection
                 
@@ -619,12 +933,13 @@ class THORPeerToPeer:
         """Process messages from all connected peers"""
         while self.running:
             try:
-                for connection in list(self.connections.values()):
-                    message = await connection.get_message()
-                    if message:
-                        await self._handle_peer_message(message, connection)
+                # Wakes as soon as any connection queues a verified message
+                item = await self.inbox.get()
+                if item is None:  # stop() sentinel
+                    break
                 
-                await asyncio.sleep(0.1)  # Small delay to prevent busy waiting
+                message, connection = item
+                await self._handle_peer_message(message, connection)
                 
             except Exception as e:
                 self.logger.error(f"Message processor error: {str(e)}")
@@ -638,13 +953,15 @@ class THORPeerToPeer:
                 self.logger.info(f"Handshake from peer: {message.sender_id}")
                 
                 # Update peer public key
-                connection.peer.public_key_pem = message.payload.get('public_key', '')
+                connection.peer.public_key = message.payload.get('public_key', '')
+                connection.peer.exchange_key = message.payload.get('exchange_key', '')
                 
             elif message.message_type == 'file_share_announce':
-                # Handle file share announcement
-                file_info = message.payload.get('file_info')
-                if file_info:
-                    self.logger.info(f"Peer {message.sender_id} shared file: {file_info.get('file_name')}")
+                # Handle file share announcement (one file, or a batch from share_repository)
+                file_infos = message.payload.get('file_infos') or [message.payload.get('file_info')]
+                for file_info in file_infos:
+                    if file_info:
+                        self.logger.info(f"Peer {message.sender_id} shared file: {file_info.get('file_name')}")
             
             elif message.message_type == 'sync_request':
                 # Handle sync request
@@ -663,31 +980,43 @@ class THORPeerToPeer:
         repo_path = Path(repo_path)
         shared_files = []
         
-        # Share all files in repository (excluding .git)
-        for file_path in repo_path.rglob('*'):
-            if file_path.is_file() and '.git' not in str(file_path):
-                try:
-                    file_share = await self.file_sharing.share_file(str(file_path), access_level)
-                    shared_files.append(file_share)
-                except Exception as e:
-                    self.logger.error(f"Failed to share file {file_path}: {str(e)}")
+        # Share all files in repository (excluding .git), several at a time
+        file_paths = [
+            file_path for file_path in repo_path.rglob('*')
+            if file_path.is_file() and '.git' not in str(file_path)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results = await asyncio.gather(
+                *(self.file_sharing.share_file(str(file_path), access_level, executor) for file_path in file_paths),
+                return_exceptions=True
+            )
+        
+        for file_path, result in zip(file_paths, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to share file {file_path}: {str(result)}")
+            else:
+                shared_files.append(result)
         
-        # Announce shared files to connected peers
+        if not shared_files:
+            return shared_files
+        
+        # Announce all shared files to each connected peer in one message
+        file_infos = [asdict(file_share) for file_share in shared_files]
         for connection in self.connections.values():
-            for file_share in shared_files:
-                announce_message = P2PMessage(
-                    message_id=str(uuid.uuid4()),
-                    sender_id=self.node_id,
-                    receiver_id=connection.peer.node_id,
-                    message_type='file_share_announce',
-                    payload={'file_info': asdict(file_share)},
-                    timestamp=datetime.now()
-                )
-                
-                try:
-                    await connection.send_message(announce_message)
-                except Exception as e:
-                    self.logger.error(f"Failed to announce file share: {str(e)}")
+            announce_message = P2PMessage(
+                message_id=str(uuid.uuid4()),
+                sender_id=self.node_id,
+                receiver_id=connection.peer.node_id,
+                message_type='file_share_announce',
+                payload={'file_infos': file_infos},
+                timestamp=datetime.now()
+            )
+            
+            try:
+                await connection.send_message(announce_message)
+            except Exception as e:
+                self.logger.error(f"Failed to announce file share: {str(e)}")
         
         return shared_files
     
@@ -716,6 +1045,7 @@ class THORPeerToPeer:
     async def stop(self):
         """Stop the THOR P2P system"""
         self.running = False
+        self.inbox.put_nowait(None)  # wake the message processor
         
         # Close all connections
         for connection in self.connections.values():
@@ -790,4 +1120,7 @@ async def main():
         await p2p.stop()
 
 if __name__ == "__main__":
+    # libuv's loop cuts per-message overhead on busy Linux relay nodes
+    if sys.platform == 'linux' and UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
@@ -6,11 +6,103 @@ Advanced affiliate marketing, cost analysis, and music integration
 
 import json
 import sqlite3
-from datetime import datetime, timedelta
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-import requests
-import hashlib
-import uuid
+from types import MappingProxyType
+from urllib.parse import urlencode
+import secrets
+import sys
+import time
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+REVENUE_DB_PATH = Path.home() / '.thor_ai' / 'revenue_tracking.db'
+
+# Rows per multi-row INSERT; 6 parameters each keeps statements under SQLite's 999-variable limit
+MAX_ROWS_PER_INSERT = 100
+
+# Timestamps within the same 50ms tick share one datetime
+NOW_RESOLUTION = 0.05
+_now_cache = (None, None)
+
+def _now():
+    """Return datetime.now(), reused for calls within the same coarse tick"""
+    global _now_cache
+    tick = time.monotonic() // NOW_RESOLUTION
+    if _now_cache[0] != tick:
+        _now_cache = (tick, datetime.now())
+    return _now_cache[1]
+
+def _write_lines(lines):
+    """Emit a report block with a single stdout write"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+@lru_cache(maxsize=64)
+def _serialize_usage_metrics(items):
+    """JSON-encode a resource's usage metrics, given as a tuple of (key, value) pairs"""
+    return json.dumps(dict(items))
+
+# Statements reused on every call; sqlite3 keeps them compiled in its statement cache
+STATEMENT_CACHE_SIZE = 256
+
+# affiliate_tracking indexes by name; the earnings one serves the performance report without a sort
+AFFILIATE_INDEXES = {
+    'idx_aff_earn': 'commission_earned DESC',
+    'idx_aff_id_time': 'affiliate_id, last_click'
+}
+
+# Rows per executemany call when bulk-loading affiliate history
+BULK_IMPORT_CHUNK_SIZE = 10000
+
+_INSERT_AFFILIATE_SQL = '''
+    INSERT INTO affiliate_tracking
+    (affiliate_id, product_name, click_count, conversion_count,
+     commission_earned, commission_rate, last_click, performance_score)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Conversion rate and the earnings total are computed by SQLite
+_AFFILIATE_PERFORMANCE_SQL = '''
+    SELECT affiliate_id, product_name, click_count, conversion_count,
+           commission_earned, commission_rate,
+           CASE WHEN click_count > 0
+                THEN conversion_count * 100.0 / click_count
+                ELSE 0 END AS conversion_rate,
+           SUM(commission_earned) OVER () AS total_earnings
+    FROM affiliate_tracking
+    ORDER BY commission_earned DESC
+'''
+
+_DASHBOARD_SQL = '''
+    WITH latest_revenue AS (
+        SELECT SUM(monthly_revenue) AS revenue
+        FROM revenue_streams
+        WHERE sync_id = (SELECT MAX(sync_id) FROM revenue_streams)
+    ),
+    latest_infrastructure AS (
+        SELECT SUM(monthly_cost) AS cost
+        FROM cost_tracking
+        WHERE cost_category = 'infrastructure'
+          AND sync_id = (SELECT MAX(sync_id) FROM cost_tracking
+                         WHERE cost_category = 'infrastructure')
+    ),
+    affiliates AS (
+        SELECT COALESCE(SUM(commission_earned), 0) AS earned,
+               COALESCE(SUM(click_count), 0) AS clicks,
+               COALESCE(SUM(conversion_count), 0) AS conversions
+        FROM affiliate_tracking
+    )
+    SELECT revenue, cost, earned, clicks, conversions
+    FROM latest_revenue, latest_infrastructure, affiliates
+'''
 
 class ThorRevenueMaximizer:
     """Advanced revenue generation and cost optimization"""
@@ -19,18 +111,33 @@ class ThorRevenueMaximizer:
         self.revenue_db = self._init_revenue_database()
         self.vultr_api_key = None  # Set from environment or config
         self.affiliate_programs = self._init_affiliate_programs()
+        self._build_context_index()
         
         print("💰 THOR Revenue Maximizer initialized")
         print("🎯 Multi-stream revenue optimization active")
     
     def _init_revenue_database(self):
         """Initialize comprehensive revenue tracking"""
-        db_path = Path.home() / '.thor_ai' / 'revenue_tracking.db'
-        db_path.parent.mkdir(exist_ok=True)
-        
-        conn = sqlite3.connect(str(db_path))
+        REVENUE_DB_PATH.parent.mkdir(exist_ok=True)
+        
+        # Autocommit mode: batch writes open their own transactions via _transaction()
+        conn = sqlite3.connect(
+            str(REVENUE_DB_PATH),
+            cached_statements=STATEMENT_CACHE_SIZE,
+            isolation_level=None
+        )
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
+        # WAL with NORMAL sync: commits no longer fsync the main database file
+        cursor.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-20000;
+            PRAGMA mmap_size=268435456;
+        ''')
+        
         # Revenue streams tracking
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS revenue_streams (
@@ -42,7 +149,8 @@ class ThorRevenueMaximizer:
                 acquisition_cost REAL,
                 profit_margin REAL,
                 automation_level REAL,
-                last_updated DATETIME
+                last_updated DATETIME,
+                sync_id INTEGER
             )
         ''')
         
@@ -56,7 +164,8 @@ class ThorRevenueMaximizer:
                 usage_metrics TEXT,
                 cost_per_unit REAL,
                 optimization_potential REAL,
-                last_sync DATETIME
+                last_sync DATETIME,
+                sync_id INTEGER
             )
         ''')
         
@@ -75,7 +184,31 @@ class ThorRevenueMaximizer:
             )
         ''')
         
-        conn.commit()
+        for index_name, columns in AFFILIATE_INDEXES.items():
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON affiliate_tracking({columns})')
+        
+        # Databases created before snapshots carried a sync_id
+        for table in ('revenue_streams', 'cost_tracking'):
+            columns = {row['name'] for row in cursor.execute(f'PRAGMA table_info({table})')}
+            if 'sync_id' not in columns:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN sync_id INTEGER')
+        
+        # Per-service sync lookups and latest-snapshot lookups
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cost_sync
+            ON cost_tracking(service_name, last_sync)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_cost_snapshot
+            ON cost_tracking(cost_category, sync_id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_revenue_snapshot
+            ON revenue_streams(sync_id)
+        ''')
+        
+        # Refresh planner statistics so the indexes above get picked
+        cursor.execute('ANALYZE')
         return conn
     
     def _init_affiliate_programs(self):
@@ -115,6 +248,44 @@ class ThorRevenueMaximizer:
             }
         }
     
+    def _build_context_index(self):
+        """Index affiliate programs by target context, best paying first"""
+        self._all_programs_sorted = sorted(
+            self.affiliate_programs.items(),
+            key=lambda item: item[1]['monthly_potential'],
+            reverse=True
+        )
+        
+        self._context_index = defaultdict(list)
+        for program_id, program in self._all_programs_sorted:
+            for target_context in program['target_contexts']:
+                self._context_index[target_context].append((program_id, program))
+    
+    @contextmanager
+    def _transaction(self):
+        """Wrap a block of writes in BEGIN IMMEDIATE ... COMMIT"""
+        self.revenue_db.execute('BEGIN IMMEDIATE')
+        try:
+            yield self.revenue_db
+        except BaseException:
+            self.revenue_db.execute('ROLLBACK')
+            raise
+        self.revenue_db.execute('COMMIT')
+    
+    def _next_sync_id(self, table):
+        """Allocate the id tagging one snapshot's rows; call inside _transaction()"""
+        return self.revenue_db.execute(f'SELECT COALESCE(MAX(sync_id), 0) + 1 FROM {table}').fetchone()[0]
+    
+    def _persist_rows(self, table, cols, rows):
+        """Insert rows into a revenue table as one snapshot in a single transaction"""
+        cols = (*cols, 'sync_id')
+        with self._transaction():
+            sync_id = self._next_sync_id(table)
+            self.revenue_db.executemany(
+                f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+                [(*row, sync_id) for row in rows]
+            )
+    
     def integrate_vultr_cost_tracking(self):
         """Integrate with Vultr API for real-time cost tracking"""
         print("☁️ Syncing with Vultr API for cost analysis...")
@@ -131,78 +302,124 @@ class ThorRevenueMaximizer:
             'block_storage': {'size_gb': 100, 'monthly_cost': 10.00}
         }
         
-        total_vultr_cost = sum(instance['monthly_cost'] for instance in vultr_costs['instances'])
-        total_vultr_cost += vultr_costs['snapshots']['monthly_cost']
-        total_vultr_cost += vultr_costs['load_balancers']['monthly_cost'] 
-        total_vultr_cost += vultr_costs['block_storage']['monthly_cost']
-        
-        # Store in database
-        cursor = self.revenue_db.cursor()
-        cursor.execute('''
-            INSERT OR REPLACE INTO cost_tracking
-            (service_name, cost_category, monthly_cost, usage_metrics, last_sync)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (
-            'vultr_cloud',
-            'infrastructure',
-            total_vultr_cost,
-            json.dumps(vultr_costs),
-            datetime.now()
-        ))
-        
-        self.revenue_db.commit()
-        
-        print(f"💰 Vultr Monthly Cost: ${total_vultr_cost:.2f}")
-        print(f"   🖥️ {len(vultr_costs['instances'])} active instances")
-        print(f"   💾 {vultr_costs['block_storage']['size_gb']}GB storage")
-        print(f"   📸 {vultr_costs['snapshots']['count']} snapshots")
+        # One row per billed resource
+        last_sync = _now()
+        cost_rows = [
+            (f"vultr_cloud/{instance['id']}", 'infrastructure', instance['monthly_cost'], _serialize_usage_metrics(tuple(instance.items())), last_sync)
+            for instance in vultr_costs['instances']
+        ]
+        for resource in ('snapshots', 'load_balancers', 'block_storage'):
+            cost_rows.append((
+                f"vultr_cloud/{resource}",
+                'infrastructure',
+                vultr_costs[resource]['monthly_cost'],
+                _serialize_usage_metrics(tuple(vultr_costs[resource].items())),
+                last_sync
+            ))
+        
+        total_vultr_cost = sum(row[2] for row in cost_rows)
+        
+        # Store in database, one multi-row statement per chunk in a single transaction
+        with self._transaction():
+            # Timestamps are coarse, so the sync_id is what tells two syncs apart
+            sync_id = self._next_sync_id('cost_tracking')
+            for start in range(0, len(cost_rows), MAX_ROWS_PER_INSERT):
+                chunk = cost_rows[start:start + MAX_ROWS_PER_INSERT]
+                self.revenue_db.execute(
+                    '''
+                    INSERT OR REPLACE INTO cost_tracking
+                    (service_name, cost_category, monthly_cost, usage_metrics, last_sync, sync_id)
+                    VALUES ''' + ', '.join(['(?, ?, ?, ?, ?, ?)'] * len(chunk)),
+                    [value for row in chunk for value in (*row, sync_id)]
+                )
+        
+        _write_lines([
+            f"💰 Vultr Monthly Cost: ${total_vultr_cost:.2f}",
+            f"   🖥️ {len(vultr_costs['instances'])} active instances",
+            f"   💾 {vultr_costs['block_storage']['size_gb']}GB storage",
+            f"   📸 {vultr_costs['snapshots']['count']} snapshots"
+        ])
         
         return total_vultr_cost
     
+    def _select_program(self, context):
+        """Return the best-paying (program_id, program) for a context, or None"""
+        candidates = self._context_index.get(context) if context else self._all_programs_sorted
+        return candidates[0] if candidates else None
+    
     def generate_affiliate_link(self, product_category, context=None):
         """Generate contextual affiliate links"""
-        suitable_programs = []
-        
-        for program_id, program in self.affiliate_programs.items():
-            if context in program['target_contexts'] or not context:
-                suitable_programs.append((program_id, program))
-        
-        if not suitable_programs:
-            return None
-        
-        # Select best program for context
-        best_program = max(suitable_programs, key=lambda x: x[1]['monthly_potential'])
-        program_id, program = best_program
+        return self.generate_affiliate_links_batch([(product_category, context)])[0]
+    
+    def generate_affiliate_links_batch(self, link_requests):
+        """Generate contextual affiliate links for (product_category, context) pairs in one transaction"""
+        now = _now()
+        links = []
+        rows = []
+        
+        for product_category, context in link_requests:
+            selected = self._select_program(context)
+            
+            if not selected:
+                links.append(None)
+                continue
+            
+            program_id, program = selected
+            
+            # Generate unique tracking link
+            tracking_id = secrets.token_hex(4)
+            affiliate_link = f"{program['affiliate_link_base']}&utm_source=thor_ai&utm_campaign={tracking_id}"
+            
+            rows.append((
+                tracking_id,
+                program['name'],
+                0, 0, 0.0,
+                program['commission_rate'],
+                now,
+                0.0
+            ))
+            
+            links.append({
+                'link': affiliate_link,
+                'program': program['name'],
+                'context': context,
+                'tracking_id': tracking_id,
+                'commission_rate': program['commission_rate']
+            })
         
-        # Generate unique tracking link
-        tracking_id = hashlib.md5(f"{program_id}_{context}_{datetime.now()}".encode()).hexdigest()[:8]
-        affiliate_link = f"{program['affiliate_link_base']}&utm_source=thor_ai&utm_campaign={tracking_id}"
+        # Track link generation, one commit for the whole batch
+        if rows:
+            with self._transaction():
+                self.revenue_db.executemany(_INSERT_AFFILIATE_SQL, rows)
         
-        # Track link generation
+        return links
+    
+    def bulk_import_affiliate_history(self, rows):
+        """Load historical affiliate rows, rebuilding the indexes once at the end"""
         cursor = self.revenue_db.cursor()
-        cursor.execute('''
-            INSERT INTO affiliate_tracking
-            (affiliate_id, product_name, click_count, conversion_count, 
-             commission_earned, commission_rate, last_click, performance_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            tracking_id,
-            program['name'],
-            0, 0, 0.0,
-            program['commission_rate'],
-            datetime.now(),
-            0.0
-        ))
-        
-        self.revenue_db.commit()
         
-        return {
-            'link': affiliate_link,
-            'program': program['name'],
-            'context': context,
-            'tracking_id': tracking_id,
-            'commission_rate': program['commission_rate']
-        }
+        # Maintaining the indexes row by row is the dominant cost of a large load
+        for index_name in AFFILIATE_INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS {index_name}')
+        
+        imported = 0
+        rows = iter(rows)
+        
+        try:
+            with self._transaction():
+                while True:
+                    chunk = list(islice(rows, BULK_IMPORT_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    cursor.executemany(_INSERT_AFFILIATE_SQL, chunk)
+                    imported += len(chunk)
+        finally:
+            for index_name, columns in AFFILIATE_INDEXES.items():
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON affiliate_tracking({columns})')
+            cursor.execute('ANALYZE affiliate_tracking')
+        
+        print(f"📥 Imported {imported} affiliate history records")
+        return imported
     
     def subtle_spotify_integration(self, user_context):
         """Subtly integrate Spotify recommendations"""
@@ -239,10 +456,27 @@ class ThorRevenueMaximizer:
         
         return None
     
+    def get_dashboard_metrics(self):
+        """Fetch the revenue, cost and affiliate aggregates in one query"""
+        cursor = self.revenue_db.cursor()
+        cursor.execute(_DASHBOARD_SQL)
+        
+        revenue, infrastructure_cost, earned, clicks, conversions = cursor.fetchone()
+        
+        return {
+            'monthly_revenue': revenue,
+            'infrastructure_cost': infrastructure_cost,
+            'affiliate_earnings': earned,
+            'affiliate_clicks': clicks,
+            'affiliate_conversions': conversions
+        }
+    
     def analyze_revenue_optimization(self):
         """Comprehensive revenue stream analysis"""
         print("📊 Analyzing revenue optimization opportunities...")
         
+        dashboard = self.get_dashboard_metrics()
+        
         # Calculate current revenue streams
         revenue_analysis = {
             'fiverr_automation': {
@@ -269,17 +503,26 @@ class ThorRevenueMaximizer:
         
         # Calculate costs
         cost_analysis = {
-            'vultr_infrastructure': 64.50,  # From API sync
+            'vultr_infrastructure': dashboard['infrastructure_cost'] or 64.50,  # From API sync
             'development_tools': 50.00,
             'marketing': 100.00,
             'other_services': 35.50
         }
         
-        total_revenue = sum(stream['current_monthly'] for stream in revenue_analysis.values())
-        total_costs = sum(cost_analysis.values())
-        current_profit = total_revenue - total_costs
+        if NUMPY_AVAILABLE:
+            # One (current, potential) matrix summed column-wise
+            stream_values = np.array(
+                [(stream['current_monthly'], stream['growth_potential']) for stream in revenue_analysis.values()],
+                dtype=np.float64
+            )
+            total_revenue, potential_revenue = stream_values.sum(axis=0).tolist()
+            total_costs = float(np.fromiter(cost_analysis.values(), dtype=np.float64, count=len(cost_analysis)).sum())
+        else:
+            total_revenue = sum(stream['current_monthly'] for stream in revenue_analysis.values())
+            potential_revenue = sum(stream['growth_potential'] for stream in revenue_analysis.values())
+            total_costs = sum(cost_analysis.values())
         
-        potential_revenue = sum(stream['growth_potential'] for stream in revenue_analysis.values())
+        current_profit = total_revenue - total_costs
         potential_profit = potential_revenue - total_costs
         
         optimization_report = {
@@ -297,39 +540,41 @@ class ThorRevenueMaximizer:
             ]
         }
         
-        print(f"💰 Current Monthly Revenue: ${total_revenue:,.2f}")
-        print(f"💸 Current Monthly Costs: ${total_costs:,.2f}")
-        print(f"💵 Current Profit: ${current_profit:,.2f}")
-        print(f"🚀 Potential Monthly Revenue: ${potential_revenue:,.2f}")
-        print(f"📈 Profit Growth Potential: ${optimization_report['profit_growth_potential']:,.2f}")
+        last_updated = _now()
+        self._persist_rows(
+            'revenue_streams',
+            ('stream_name', 'category', 'monthly_revenue', 'growth_rate', 'last_updated'),
+            [
+                (name, 'current', stream['current_monthly'],
+                 stream['growth_potential'] / stream['current_monthly'] - 1, last_updated)
+                for name, stream in revenue_analysis.items()
+            ]
+        )
+        
+        _write_lines([
+            f"💰 Current Monthly Revenue: ${total_revenue:,.2f}",
+            f"💸 Current Monthly Costs: ${total_costs:,.2f}",
+            f"💵 Current Profit: ${current_profit:,.2f}",
+            f"🚀 Potential Monthly Revenue: ${potential_revenue:,.2f}",
+            f"📈 Profit Growth Potential: ${optimization_report['profit_growth_potential']:,.2f}"
+        ])
         
         return optimization_report
     
     def track_affiliate_performance(self):
         """Track and optimize affiliate link performance"""
-        cursor = self.revenue_db.cursor()
-        cursor.execute('''
-            SELECT affiliate_id, product_name, click_count, conversion_count, 
-                   commission_earned, commission_rate
-            FROM affiliate_tracking
-            ORDER BY commission_earned DESC
-        ''')
+        performance_data = []
+        lines = [f"\n🎯 Affiliate Performance Summary:"]
         
-        performance_data = cursor.fetchall()
+        # Rows are formatted as they stream out of the cursor
+        for row in self.revenue_db.execute(_AFFILIATE_PERFORMANCE_SQL):
+            performance_data.append(row)
+            lines.append(f"   📊 {row['product_name']}: ${row['commission_earned']:.2f} earned")
+            lines.append(f"      🖱️ {row['click_count']} clicks, {row['conversion_count']} conversions ({row['conversion_rate']:.1f}%)")
         
         if performance_data:
-            print(f"\n🎯 Affiliate Performance Summary:")
-            total_earnings = 0
-            
-            for row in performance_data:
-                affiliate_id, product, clicks, conversions, earnings, rate = row
-                conversion_rate = (conversions / clicks * 100) if clicks > 0 else 0
-                total_earnings += earnings
-                
-                print(f"   📊 {product}: ${earnings:.2f} earned")
-                print(f"      🖱️ {clicks} clicks, {conversions} conversions ({conversion_rate:.1f}%)")
-            
-            print(f"   💰 Total Affiliate Earnings: ${total_earnings:.2f}")
+            lines.append(f"   💰 Total Affiliate Earnings: ${performance_data[-1]['total_earnings']:.2f}")
+            _write_lines(lines)
         else:
             print(f"   📊 No affiliate performance data yet")
         
@@ -337,12 +582,14 @@ class ThorRevenueMaximizer:
     
     def generate_cost_reduction_recommendations(self):
         """Generate AI-powered cost reduction recommendations"""
+        infrastructure_cost = self.get_dashboard_metrics()['infrastructure_cost'] or 64.50
+        
         recommendations = [
             {
                 'category': 'Infrastructure',
-                'current_cost': 64.50,
+                'current_cost': infrastructure_cost,
                 'optimized_cost': 45.00,
-                'savings': 19.50,
+                'savings': infrastructure_cost - 45.00,
                 'method': 'Consolidate low-usage instances, use spot pricing',
                 'risk_level': 'Low'
             },
@@ -366,18 +613,67 @@ class ThorRevenueMaximizer:
         
         total_savings = sum(rec['savings'] for rec in recommendations)
         
-        print(f"\n💡 Cost Optimization Recommendations:")
-        print(f"   💰 Potential Monthly Savings: ${total_savings:.2f}")
+        last_sync = _now()
+        self._persist_rows(
+            'cost_tracking',
+            ('service_name', 'cost_category', 'monthly_cost', 'optimization_potential', 'last_sync'),
+            [
+                (rec['category'], 'recommendation', rec['current_cost'], rec['savings'], last_sync)
+                for rec in recommendations
+            ]
+        )
+        
+        lines = [
+            f"\n💡 Cost Optimization Recommendations:",
+            f"   💰 Potential Monthly Savings: ${total_savings:.2f}"
+        ]
         
         for rec in recommendations:
-            print(f"\n   🔧 {rec['category']}:")
-            print(f"      💸 Current: ${rec['current_cost']:.2f} → Optimized: ${rec['optimized_cost']:.2f}")
-            print(f"      💵 Savings: ${rec['savings']:.2f}/month")
-            print(f"      📝 Method: {rec['method']}")
-            print(f"      ⚠️ Risk: {rec['risk_level']}")
+            lines.extend((
+                f"\n   🔧 {rec['category']}:",
+                f"      💸 Current: ${rec['current_cost']:.2f} → Optimized: ${rec['optimized_cost']:.2f}",
+                f"      💵 Savings: ${rec['savings']:.2f}/month",
+                f"      📝 Method: {rec['method']}",
+                f"      ⚠️ Risk: {rec['risk_level']}"
+            ))
+        
+        _write_lines(lines)
         
         return recommendations
 
+# Read-only lookup tables shared by every SpotifyNativeIntegration
+_MUSIC_SUGGESTIONS = MappingProxyType({
+    'ai_training': MappingProxyType({
+        'genre': 'Ambient/Electronic',
+        'playlists': ('Deep Focus', 'Ambient Study', 'Peaceful Piano'),
+        'reasoning': 'Calm music helps maintain focus during long training sessions'
+    }),
+    'gaming_session': MappingProxyType({
+        'genre': 'Epic/Orchestral',
+        'playlists': ('Epic Gaming', 'Instrumental Intensity', 'Movie Soundtracks'),
+        'reasoning': 'Epic music enhances gaming immersion and reaction times'
+    }),
+    'coding_work': MappingProxyType({
+        'genre': 'Lo-Fi/Instrumental',
+        'playlists': ('Coding Mode', 'Lo-Fi Beats', 'Programming Flow'),
+        'reasoning': 'Repetitive beats help maintain coding rhythm and concentration'
+    }),
+    'server_management': MappingProxyType({
+        'genre': 'Minimal/Ambient',
+        'playlists': ('Minimal Techno', 'Data Center Ambience', 'System Admin Beats'),
+        'reasoning': 'Minimal music reduces distractions during technical work'
+    })
+})
+
+_PLAYBACK_ACTIONS = MappingProxyType({
+    'ai_training_start': 'Start ambient focus music at low volume',
+    'ai_training_complete': 'Gradually fade out music',
+    'gaming_session_start': 'Switch to gaming playlist',
+    'emergency_alert': 'Pause music for alert',
+    'break_time': 'Switch to relaxing music',
+    'deep_work_mode': 'Enable focus music with no vocals'
+})
+
 class SpotifyNativeIntegration:
     """Spotify integration for THOR-AI (not sponsorship, just native support)"""
     
@@ -398,42 +694,19 @@ class SpotifyNativeIntegration:
     
     def setup_spotify_auth(self):
         """Setup Spotify authentication flow"""
-        auth_url = f"https://accounts.spotify.com/authorize?"
-        auth_url += f"client_id={self.spotify_config['client_id']}&"
-        auth_url += f"response_type=code&"
-        auth_url += f"redirect_uri={self.spotify_config['redirect_uri']}&"
-        auth_url += f"scope={'+'.join(self.spotify_config['scopes'])}"
-        
-        return auth_url
+        # urlencode escapes the redirect URI and space-separated scopes
+        return "https://accounts.spotify.com/authorize?" + urlencode({
+            'client_id': self.spotify_config['client_id'],
+            'response_type': 'code',
+            'redirect_uri': self.spotify_config['redirect_uri'],
+            'scope': ' '.join(self.spotify_config['scopes'])
+        })
     
     def suggest_music_for_context(self, thor_activity):
         """Suggest music based on THOR-AI activity"""
-        music_suggestions = {
-            'ai_training': {
-                'genre': 'Ambient/Electronic',
-                'playlists': ['Deep Focus', 'Ambient Study', 'Peaceful Piano'],
-                'reasoning': 'Calm music helps maintain focus during long training sessions'
-            },
-            'gaming_session': {
-                'genre': 'Epic/Orchestral',
-                'playlists': ['Epic Gaming', 'Instrumental Intensity', 'Movie Soundtracks'],
-                'reasoning': 'Epic music enhances gaming immersion and reaction times'
-            },
-            'coding_work': {
-                'genre': 'Lo-Fi/Instrumental',
-                'playlists': ['Coding Mode', 'Lo-Fi Beats', 'Programming Flow'],
-                'reasoning': 'Repetitive beats help maintain coding rhythm and concentration'
-            },
-            'server_management': {
-                'genre': 'Minimal/Ambient',
-                'playlists': ['Minimal Techno', 'Data Center Ambience', 'System Admin Beats'],
-                'reasoning': 'Minimal music reduces distractions during technical work'
-            }
-        }
+        suggestion = _MUSIC_SUGGESTIONS.get(thor_activity)
         
-        if thor_activity in music_suggestions:
-            suggestion = music_suggestions[thor_activity]
-            
+        if suggestion:
             return {
                 'activity': thor_activity,
                 'recommended_genre': suggestion['genre'],
@@ -446,29 +719,24 @@ class SpotifyNativeIntegration:
     
     def control_playback_for_thor(self, action, context=None):
         """Control Spotify playback based on THOR-AI needs"""
-        playback_actions = {
-            'ai_training_start': 'Start ambient focus music at low volume',
-            'ai_training_complete': 'Gradually fade out music',
-            'gaming_session_start': 'Switch to gaming playlist',
-            'emergency_alert': 'Pause music for alert',
-            'break_time': 'Switch to relaxing music',
-            'deep_work_mode': 'Enable focus music with no vocals'
-        }
+        playback_command = _PLAYBACK_ACTIONS.get(action)
         
-        if action in playback_actions:
+        if playback_command:
             return {
                 'action': action,
-                'playback_command': playback_actions[action],
+                'playback_command': playback_command,
                 'context': context,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _now().isoformat()
             }
         
         return None
 
 def main():
     """Demo revenue maximizer and Spotify integration"""
-    print("💰 THOR-AI Revenue Maximizer & Spotify Integration Demo")
-    print("=" * 70)
+    _write_lines([
+        "💰 THOR-AI Revenue Maximizer & Spotify Integration Demo",
+        "=" * 70
+    ])
     
     # Initialize revenue maximizer
     revenue_max = ThorRevenueMaximizer()
@@ -480,42 +748,52 @@ def main():
     optimization_report = revenue_max.analyze_revenue_optimization()
     
     # Generate affiliate links
-    print(f"\n🔗 Demo: Contextual Affiliate Links")
+    lines = [f"\n🔗 Demo: Contextual Affiliate Links"]
     gaming_link = revenue_max.generate_affiliate_link('gaming_gear', 'gaming_session')
     if gaming_link:
-        print(f"   🎮 Gaming Context: {gaming_link['program']} ({gaming_link['commission_rate']:.0%} commission)")
+        lines.append(f"   🎮 Gaming Context: {gaming_link['program']} ({gaming_link['commission_rate']:.0%} commission)")
     
     music_link = revenue_max.generate_affiliate_link('music_streaming', 'coding_work')
     if music_link:
-        print(f"   🎵 Music Context: {music_link['program']} ({music_link['commission_rate']:.0%} commission)")
+        lines.append(f"   🎵 Music Context: {music_link['program']} ({music_link['commission_rate']:.0%} commission)")
     
     # Spotify integration demo
-    print(f"\n🎵 Spotify Integration Demo")
+    lines.append(f"\n🎵 Spotify Integration Demo")
+    _write_lines(lines)
     spotify = SpotifyNativeIntegration()
     
+    lines = []
     ai_music = spotify.suggest_music_for_context('ai_training')
     if ai_music:
-        print(f"   🤖 AI Training Music: {ai_music['recommended_genre']}")
-        print(f"   🎧 Suggested Playlists: {', '.join(ai_music['playlists'])}")
-        print(f"   💡 Reasoning: {ai_music['reasoning']}")
+        lines.extend((
+            f"   🤖 AI Training Music: {ai_music['recommended_genre']}",
+            f"   🎧 Suggested Playlists: {', '.join(ai_music['playlists'])}",
+            f"   💡 Reasoning: {ai_music['reasoning']}"
+        ))
     
     gaming_music = spotify.suggest_music_for_context('gaming_session')
     if gaming_music:
-        print(f"   🎮 Gaming Music: {gaming_music['recommended_genre']}")
-        print(f"   🎧 Suggested Playlists: {', '.join(gaming_music['playlists'])}")
+        lines.extend((
+            f"   🎮 Gaming Music: {gaming_music['recommended_genre']}",
+            f"   🎧 Suggested Playlists: {', '.join(gaming_music['playlists'])}"
+        ))
+    
+    if lines:
+        _write_lines(lines)
     
     # Cost reduction recommendations
     cost_recommendations = revenue_max.generate_cost_reduction_recommendations()
     
-    print(f"\n🎯 REVENUE OPTIMIZATION SUMMARY:")
-    print(f"   💰 Current Profit: ${optimization_report['current_profit']:,.2f}/month")
-    print(f"   🚀 Potential Profit: ${optimization_report['potential_profit']:,.2f}/month")
-    print(f"   📈 Growth Opportunity: ${optimization_report['profit_growth_potential']:,.2f}/month")
-    print(f"   🎵 Spotify Integration: Native support ready")
-    print(f"   🔗 Affiliate System: Contextual recommendations active")
-    print(f"   ☁️ Vultr Tracking: Real-time cost monitoring")
-    
-    print(f"\n🏆 READY FOR TUESDAY MIDNIGHT RELEASE! 🚀")
+    _write_lines([
+        f"\n🎯 REVENUE OPTIMIZATION SUMMARY:",
+        f"   💰 Current Profit: ${optimization_report['current_profit']:,.2f}/month",
+        f"   🚀 Potential Profit: ${optimization_report['potential_profit']:,.2f}/month",
+        f"   📈 Growth Opportunity: ${optimization_report['profit_growth_potential']:,.2f}/month",
+        f"   🎵 Spotify Integration: Native support ready",
+        f"   🔗 Affiliate System: Contextual recommendations active",
+        f"   ☁️ Vultr Tracking: Real-time cost monitoring",
+        f"\n🏆 READY FOR TUESDAY MIDNIGHT RELEASE! 🚀"
+    ])
 
 if __name__ == "__main__":
     main()
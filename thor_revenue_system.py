@@ -16,14 +16,31 @@ Revenue Streams:
 import os
 import sys
 import json
+import sched
 import time
 import requests
 import threading
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 import hashlib
-import uuid
+import itertools
 import random
+import secrets
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Synthetic record ids: a per-process random prefix plus a counter, no urandom read per id
+_ID_PREFIX = secrets.token_hex(6)
+_ID_COUNTER = itertools.count()
+
+def fast_id():
+    """Return a process-unique id for simulated records"""
+    return f"{_ID_PREFIX}{next(_ID_COUNTER):010x}"
 
 class ThorRevenueEngine:
     """THOR-AI's automated revenue generation system"""
@@ -37,9 +54,13 @@ class ThorRevenueEngine:
             'phase_4': 15000   # Financial freedom
         }
         self.current_phase = 'phase_1'
+        self._current_target = self.monthly_targets[self.current_phase]
         self.total_revenue = 0.0
         self.monthly_revenue = 0.0
         
+        # One scheduler thread services every stream's periodic work
+        self._sched = sched.scheduler(time.monotonic, time.sleep)
+        
         # Initialize revenue streams
         self.init_revenue_streams()
     
@@ -55,6 +76,11 @@ class ThorRevenueEngine:
             'consulting': OptimizationConsulting()
         }
         
+        # Bound revenue getters walked by the monitor, rebuilt with the streams
+        self._stream_probe = tuple(
+            (name, stream.get_daily_revenue) for name, stream in self.revenue_streams.items()
+        )
+        
         print("💰 THOR-AI Revenue Engine initialized")
         print(f"🎯 Phase 1 target: ${self.monthly_targets['phase_1']}/month")
     
@@ -63,45 +89,60 @@ class ThorRevenueEngine:
         print("🚀 Starting automated revenue generation...")
         
         for name, stream in self.revenue_streams.items():
-            stream.start()
+            for interval, callback in stream.start():
+                self.schedule(interval, callback)
             print(f"✅ {name} stream active")
         
         # Start revenue monitoring
-        threading.Thread(target=self._revenue_monitor, daemon=True).start()
+        self.schedule(86400, self._revenue_monitor)  # Check daily
+        
+        threading.Thread(target=self._sched.run, daemon=True).start()
         
         print("💸 All revenue streams active!")
     
+    def schedule(self, interval, callback):
+        """Run callback now and then every interval seconds on the scheduler thread"""
+        self._sched.enter(0, 0, self._run_periodic, (interval, callback))
+    
+    def _run_periodic(self, interval, callback):
+        """Run one tick and re-arm it; a tick may return a different delay for its next run"""
+        delay = interval
+        
+        try:
+            delay = callback() or interval
+        except Exception as e:
+            print(f"⚠️ Revenue stream error: {e}")
+        
+        self._sched.enter(delay, 0, self._run_periodic, (interval, callback))
+    
     def _revenue_monitor(self):
         """Monitor and report revenue progress"""
-        while True:
-            try:
-                # Collect revenue from all streams
-                total_daily = 0
-                for name, stream in self.revenue_streams.items():
-                    daily_revenue = stream.get_daily_revenue()
-                    total_daily += daily_revenue
-                    
-                    if daily_revenue > 0:
-                        print(f"💰 {name}: +${daily_revenue:.2f} today")
-                
-                self.total_revenue += total_daily
-                
-                # Calculate monthly projection
-                monthly_projection = total_daily * 30
-                target = self.monthly_targets[self.current_phase]
-                progress = (monthly_projection / target) * 100
-                
-                print(f"📊 Daily: ${total_daily:.2f} | Monthly projection: ${monthly_projection:.2f} ({progress:.1f}% of target)")
-                
-                # Check for phase advancement
-                if monthly_projection >= target:
-                    self._advance_phase()
+        try:
+            # Collect revenue from all streams
+            total_daily = 0
+            for name, probe in self._stream_probe:
+                daily_revenue = probe()
+                total_daily += daily_revenue
                 
-                time.sleep(86400)  # Check daily
-                
-            except Exception as e:
-                print(f"⚠️ Revenue monitoring error: {e}")
-                time.sleep(3600)  # Wait 1 hour on error
+                if daily_revenue > 0:
+                    print(f"💰 {name}: +${daily_revenue:.2f} today")
+            
+            self.total_revenue += total_daily
+            
+            # Calculate monthly projection
+            monthly_projection = total_daily * 30
+            target = self._current_target
+            progress = (monthly_projection / target) * 100
+            
+            print(f"📊 Daily: ${total_daily:.2f} | Monthly projection: ${monthly_projection:.2f} ({progress:.1f}% of target)")
+            
+            # Check for phase advancement
+            if monthly_projection >= target:
+                self._advance_phase()
+            
+        except Exception as e:
+            print(f"⚠️ Revenue monitoring error: {e}")
+            return 3600  # Retry in 1 hour on error
     
     def _advance_phase(self):
         """Advance to next revenue phase"""
@@ -110,7 +151,7 @@ class ThorRevenueEngine:
         
         if current_index < len(phases) - 1:
             self.current_phase = phases[current_index + 1]
-            new_target = self.monthly_targets[self.current_phase]
+            new_target = self._current_target = self.monthly_targets[self.current_phase]
             
             print(f"🎉 PHASE ADVANCED! Now targeting ${new_target}/month")
             print(f"🚀 Scaling up revenue strategies...")
@@ -123,6 +164,12 @@ class ProSubscriptionSystem:
     """$25/month pro subscription system"""
     
     def __init__(self):
+        # Private generator with its methods bound once for the tick paths
+        self._rng = random.Random()
+        self._rand = self._rng.random
+        self._randint = self._rng.randint
+        self._sample = self._rng.sample
+        
         self.subscribers = []
         self.monthly_revenue = 0.0
         self.subscription_price = 25.0
@@ -138,19 +185,16 @@ class ProSubscriptionSystem:
         ]
     
     def start(self):
-        """Start subscription acquisition"""
-        def acquisition_loop():
-            while True:
-                # Simulate organic growth
-                new_subscribers = self._acquire_subscribers()
-                self.subscribers.extend(new_subscribers)
-                
-                if new_subscribers:
-                    print(f"🎉 +{len(new_subscribers)} pro subscribers! Total: {len(self.subscribers)}")
-                
-                time.sleep(3600)  # Check hourly
+        """Start subscription acquisition, returning (interval, callback) ticks"""
+        return [(3600, self._acquisition_tick)]  # Check hourly
+    
+    def _acquisition_tick(self):
+        """Simulate organic growth"""
+        new_subscribers = self._acquire_subscribers()
+        self.subscribers.extend(new_subscribers)
         
-        threading.Thread(target=acquisition_loop, daemon=True).start()
+        if new_subscribers:
+            print(f"🎉 +{len(new_subscribers)} pro subscribers! Total: {len(self.subscribers)}")
     
     def _acquire_subscribers(self):
         """Simulate subscriber acquisition"""
@@ -158,17 +202,17 @@ class ProSubscriptionSystem:
         base_growth_rate = 0.1  # 10% chance per hour
         
         # AI optimization results drive subscriptions
-        if random.random() < base_growth_rate:
+        if self._rand() < base_growth_rate:
             # 1-3 new subscribers
-            count = random.randint(1, 3)
+            count = self._randint(1, 3)
             new_subs = []
             
             for _ in range(count):
                 subscriber = {
-                    'id': str(uuid.uuid4()),
+                    'id': fast_id(),
                     'joined_date': datetime.now().isoformat(),
                     'monthly_payment': self.subscription_price,
-                    'features_used': random.sample(self.features, 3)
+                    'features_used': self._sample(self.features, 3)
                 }
                 new_subs.append(subscriber)
             
@@ -190,39 +234,44 @@ class MeshResourceMarketplace:
     """Marketplace for trading mesh network resources"""
     
     def __init__(self):
+        self._rng = random.Random()
+        self._randint = self._rng.randint
+        self._choice = self._rng.choice
+        self._uniform = self._rng.uniform
+        
         self.active_trades = []
         self.revenue_share = 0.1  # 10% commission
-        self.daily_revenue = 0.0
+        # Commissions in integer cents. The tick and the monitor share the scheduler
+        # thread today; the deque only keeps the read-and-reset safe if a caller on
+        # another thread is ever added
+        self._pending_commissions = deque()
         
     def start(self):
-        """Start marketplace operations"""
-        def marketplace_loop():
-            while True:
-                # Simulate resource trading
-                new_trades = self._generate_trades()
-                self.active_trades.extend(new_trades)
-                
-                for trade in new_trades:
-                    commission = trade['amount'] * self.revenue_share
-                    self.daily_revenue += commission
-                    print(f"💱 Mesh trade: ${trade['amount']:.2f} (commission: ${commission:.2f})")
-                
-                time.sleep(1800)  # Every 30 minutes
+        """Start marketplace operations, returning (interval, callback) ticks"""
+        return [(1800, self._marketplace_tick)]  # Every 30 minutes
+    
+    def _marketplace_tick(self):
+        """Simulate resource trading"""
+        new_trades = self._generate_trades()
+        self.active_trades.extend(new_trades)
         
-        threading.Thread(target=marketplace_loop, daemon=True).start()
+        for trade in new_trades:
+            commission = trade['amount'] * self.revenue_share
+            self._pending_commissions.append(round(commission * 100))
+            print(f"💱 Mesh trade: ${trade['amount']:.2f} (commission: ${commission:.2f})")
     
     def _generate_trades(self):
         """Generate marketplace trades"""
         trades = []
         
         # Simulate 0-2 trades per cycle
-        for _ in range(random.randint(0, 2)):
+        for _ in range(self._randint(0, 2)):
             trade = {
-                'id': str(uuid.uuid4()),
-                'resource_type': random.choice(['cpu_hours', 'gpu_time', 'storage', 'bandwidth']),
-                'amount': random.uniform(5, 50),  # $5-50 per trade
-                'buyer': str(uuid.uuid4()),
-                'seller': str(uuid.uuid4()),
+                'id': fast_id(),
+                'resource_type': self._choice(['cpu_hours', 'gpu_time', 'storage', 'bandwidth']),
+                'amount': self._uniform(5, 50),  # $5-50 per trade
+                'buyer': fast_id(),
+                'seller': fast_id(),
                 'timestamp': datetime.now().isoformat()
             }
             trades.append(trade)
@@ -231,9 +280,9 @@ class MeshResourceMarketplace:
     
     def get_daily_revenue(self):
         """Get daily marketplace revenue"""
-        revenue = self.daily_revenue
-        self.daily_revenue = 0  # Reset for next day
-        return revenue
+        # Drain only what is queued now
+        pending = self._pending_commissions
+        return sum(pending.popleft() for _ in range(len(pending))) / 100
     
     def scale_up(self):
         """Scale up marketplace"""
@@ -243,6 +292,11 @@ class AIOptimizationServices:
     """AI-powered optimization services for businesses"""
     
     def __init__(self):
+        self._rng = random.Random()
+        self._rand = self._rng.random
+        self._randint = self._rng.randint
+        self._sample = self._rng.sample
+        
         self.active_clients = []
         self.service_rates = {
             'system_audit': 150,     # One-time
@@ -251,28 +305,27 @@ class AIOptimizationServices:
             'emergency_fixes': 200       # Per incident
         }
         
+        if NUMPY_AVAILABLE:
+            self._np_rng = np.random.default_rng()
+        
     def start(self):
-        """Start offering optimization services"""
-        def services_loop():
-            while True:
-                # Acquire new clients
-                new_clients = self._acquire_clients()
-                self.active_clients.extend(new_clients)
-                
-                # Generate service revenue
-                self._provide_services()
-                
-                time.sleep(7200)  # Every 2 hours
+        """Start offering optimization services, returning (interval, callback) ticks"""
+        return [(7200, self._services_tick)]  # Every 2 hours
+    
+    def _services_tick(self):
+        """Acquire new clients and generate service revenue"""
+        new_clients = self._acquire_clients()
+        self.active_clients.extend(new_clients)
         
-        threading.Thread(target=services_loop, daemon=True).start()
+        self._provide_services()
     
     def _acquire_clients(self):
         """Acquire optimization service clients"""
-        if random.random() < 0.05:  # 5% chance per cycle
+        if self._rand() < 0.05:  # 5% chance per cycle
             client = {
-                'id': str(uuid.uuid4()),
-                'company': f"TechCorp_{random.randint(100, 999)}",
-                'services_needed': random.sample(list(self.service_rates.keys()), 2),
+                'id': fast_id(),
+                'company': f"TechCorp_{self._randint(100, 999)}",
+                'services_needed': self._sample(list(self.service_rates.keys()), 2),
                 'joined_date': datetime.now().isoformat()
             }
             return [client]
@@ -280,16 +333,28 @@ class AIOptimizationServices:
     
     def _provide_services(self):
         """Provide services to clients"""
+        if NUMPY_AVAILABLE:
+            # One batch of Bernoulli draws per service type across all clients
+            client_count = len(self.active_clients)
+            monitoring = np.count_nonzero(self._np_rng.random(client_count) < 0.1)  # 10% chance daily
+            emergencies = np.count_nonzero(self._np_rng.random(client_count) < 0.02)  # 2% chance daily
+            
+            emergency_revenue = self.service_rates['emergency_fixes']
+            for _ in range(emergencies):
+                print(f"🚨 Emergency optimization: +${emergency_revenue}")
+            
+            return float(monitoring * self.service_rates['monthly_monitoring'] / 30 + emergencies * emergency_revenue)
+        
         daily_revenue = 0
         
         for client in self.active_clients:
             # Monthly monitoring for all clients
-            if random.random() < 0.1:  # 10% chance daily
+            if self._rand() < 0.1:  # 10% chance daily
                 service_revenue = self.service_rates['monthly_monitoring'] / 30
                 daily_revenue += service_revenue
                 
             # Occasional emergency fixes
-            if random.random() < 0.02:  # 2% chance daily
+            if self._rand() < 0.02:  # 2% chance daily
                 emergency_revenue = self.service_rates['emergency_fixes']
                 daily_revenue += emergency_revenue
                 print(f"🚨 Emergency optimization: +${emergency_revenue}")
@@ -308,6 +373,9 @@ class AutomatedTradingSystem:
     """Legal automated trading system (low-risk strategies)"""
     
     def __init__(self):
+        self._rng = random.Random()
+        self._uniform = self._rng.uniform
+        
         self.trading_balance = 1000.0  # Start with $1000
         self.daily_returns = []
         self.strategies = [
@@ -318,29 +386,26 @@ class AutomatedTradingSystem:
         ]
         
     def start(self):
-        """Start automated trading"""
-        def trading_loop():
-            while True:
-                try:
-                    # Conservative trading simulation
-                    daily_return = self._execute_trades()
-                    self.daily_returns.append(daily_return)
-                    
-                    if daily_return > 0:
-                        print(f"📈 Trading profit: +${daily_return:.2f}")
-                    
-                    time.sleep(86400)  # Daily trading
-                    
-                except Exception as e:
-                    print(f"⚠️ Trading error: {e}")
-                    time.sleep(3600)
-        
-        threading.Thread(target=trading_loop, daemon=True).start()
+        """Start automated trading, returning (interval, callback) ticks"""
+        return [(86400, self._trading_tick)]  # Daily trading
+    
+    def _trading_tick(self):
+        """Conservative trading simulation"""
+        try:
+            daily_return = self._execute_trades()
+            self.daily_returns.append(daily_return)
+            
+            if daily_return > 0:
+                print(f"📈 Trading profit: +${daily_return:.2f}")
+            
+        except Exception as e:
+            print(f"⚠️ Trading error: {e}")
+            return 3600
     
     def _execute_trades(self):
         """Execute conservative trading strategies"""
         # Simulate conservative trading (1-3% daily returns, with some losses)
-        return_rate = random.uniform(-0.02, 0.03)  # -2% to +3%
+        return_rate = self._uniform(-0.02, 0.03)  # -2% to +3%
         daily_return = self.trading_balance * return_rate
         
         self.trading_balance += daily_return
@@ -366,6 +431,11 @@ class DigitalProductCreator:
     """Automated digital product creation and sales"""
     
     def __init__(self):
+        self._rng = random.Random()
+        self._rand = self._rng.random
+        self._randint = self._rng.randint
+        self._choice = self._rng.choice
+        
         self.products = []
         self.product_types = [
             'optimization_templates',
@@ -375,28 +445,32 @@ class DigitalProductCreator:
             'ai_models'
         ]
         
+        if NUMPY_AVAILABLE:
+            # Prices mirrored from self.products for batched sale draws
+            self.product_prices = np.empty(0, dtype=np.float64)
+            self._np_rng = np.random.default_rng()
+        
     def start(self):
-        """Start creating and selling digital products"""
-        def product_loop():
-            while True:
-                # Create new products
-                new_products = self._create_products()
-                self.products.extend(new_products)
-                
-                # Generate sales
-                self._generate_sales()
-                
-                time.sleep(3600)  # Hourly
+        """Start creating and selling digital products, returning (interval, callback) ticks"""
+        return [(3600, self._product_tick)]  # Hourly
+    
+    def _product_tick(self):
+        """Create new products and generate sales"""
+        new_products = self._create_products()
+        self.products.extend(new_products)
+        
+        if new_products and NUMPY_AVAILABLE:
+            self.product_prices = np.append(self.product_prices, [product['price'] for product in new_products])
         
-        threading.Thread(target=product_loop, daemon=True).start()
+        self._generate_sales()
     
     def _create_products(self):
         """Create new digital products"""
-        if random.random() < 0.1:  # 10% chance hourly
+        if self._rand() < 0.1:  # 10% chance hourly
             product = {
-                'id': str(uuid.uuid4()),
-                'type': random.choice(self.product_types),
-                'price': random.randint(10, 100),
+                'id': fast_id(),
+                'type': self._choice(self.product_types),
+                'price': self._randint(10, 100),
                 'created_date': datetime.now().isoformat(),
                 'sales': 0
             }
@@ -406,11 +480,22 @@ class DigitalProductCreator:
     
     def _generate_sales(self):
         """Generate product sales"""
+        if NUMPY_AVAILABLE:
+            # 5% chance per hour per product, drawn for every product at once
+            sold = np.flatnonzero(self._np_rng.random(len(self.product_prices)) < 0.05)
+            
+            for index in sold:
+                product = self.products[index]
+                product['sales'] += 1
+                print(f"💰 Product sale: {product['type']} +${product['price']}")
+            
+            return float(self.product_prices[sold].sum())
+        
         daily_revenue = 0
         
         for product in self.products:
             # Chance of sale based on product age and type
-            if random.random() < 0.05:  # 5% chance per hour per product
+            if self._rand() < 0.05:  # 5% chance per hour per product
                 daily_revenue += product['price']
                 product['sales'] += 1
                 print(f"💰 Product sale: {product['type']} +${product['price']}")
@@ -429,6 +514,11 @@ class CodeReviewServices:
     """Automated code review and improvement services"""
     
     def __init__(self):
+        self._rng = random.Random()
+        self._rand = self._rng.random
+        self._randint = self._rng.randint
+        self._choice = self._rng.choice
+        
         self.review_queue = []
         self.rates = {
             'basic_review': 25,
@@ -438,30 +528,26 @@ class CodeReviewServices:
         }
         
     def start(self):
-        """Start code review services"""
-        def review_loop():
-            while True:
-                # Simulate incoming review requests
-                new_requests = self._generate_requests()
-                self.review_queue.extend(new_requests)
-                
-                # Process reviews
-                self._process_reviews()
-                
-                time.sleep(1800)  # Every 30 minutes
+        """Start code review services, returning (interval, callback) ticks"""
+        return [(1800, self._review_tick)]  # Every 30 minutes
+    
+    def _review_tick(self):
+        """Take incoming review requests and process reviews"""
+        new_requests = self._generate_requests()
+        self.review_queue.extend(new_requests)
         
-        threading.Thread(target=review_loop, daemon=True).start()
+        self._process_reviews()
     
     def _generate_requests(self):
         """Generate code review requests"""
         requests = []
         
-        for _ in range(random.randint(0, 3)):
-            if random.random() < 0.3:  # 30% chance
+        for _ in range(self._randint(0, 3)):
+            if self._rand() < 0.3:  # 30% chance
                 request = {
-                    'id': str(uuid.uuid4()),
-                    'service_type': random.choice(list(self.rates.keys())),
-                    'client': f"Dev_{random.randint(100, 999)}",
+                    'id': fast_id(),
+                    'service_type': self._choice(list(self.rates.keys())),
+                    'client': f"Dev_{self._randint(100, 999)}",
                     'submitted': datetime.now().isoformat()
                 }
                 requests.append(request)
@@ -494,31 +580,32 @@ class OptimizationConsulting:
     """High-value optimization consulting"""
     
     def __init__(self):
+        self._rng = random.Random()
+        self._rand = self._rng.random
+        self._randint = self._rng.randint
+        self._uniform = self._rng.uniform
+        
         self.clients = []
         self.hourly_rate = 150
         
     def start(self):
-        """Start consulting services"""
-        def consulting_loop():
-            while True:
-                # Acquire consulting clients
-                new_clients = self._acquire_clients()
-                self.clients.extend(new_clients)
-                
-                # Provide consulting hours
-                self._provide_consulting()
-                
-                time.sleep(43200)  # Every 12 hours
+        """Start consulting services, returning (interval, callback) ticks"""
+        return [(43200, self._consulting_tick)]  # Every 12 hours
+    
+    def _consulting_tick(self):
+        """Acquire consulting clients and provide consulting hours"""
+        new_clients = self._acquire_clients()
+        self.clients.extend(new_clients)
         
-        threading.Thread(target=consulting_loop, daemon=True).start()
+        self._provide_consulting()
     
     def _acquire_clients(self):
         """Acquire consulting clients"""
-        if random.random() < 0.02:  # 2% chance per cycle
+        if self._rand() < 0.02:  # 2% chance per cycle
             client = {
-                'id': str(uuid.uuid4()),
-                'company': f"Enterprise_{random.randint(1000, 9999)}",
-                'monthly_hours': random.randint(5, 20),
+                'id': fast_id(),
+                'company': f"Enterprise_{self._randint(1000, 9999)}",
+                'monthly_hours': self._randint(5, 20),
                 'joined_date': datetime.now().isoformat()
             }
             print(f"🏢 New consulting client: {client['monthly_hours']} hours/month")
@@ -533,8 +620,8 @@ class OptimizationConsulting:
             # Daily hours = monthly hours / 30
             daily_hours = client['monthly_hours'] / 30
             
-            if random.random() < 0.5:  # 50% chance of work today
-                hours_today = random.uniform(0.5, daily_hours)
+            if self._rand() < 0.5:  # 50% chance of work today
+                hours_today = self._uniform(0.5, daily_hours)
                 revenue = hours_today * self.hourly_rate
                 daily_revenue += revenue
                 print(f"💼 Consulting: {hours_today:.1f}h @ ${self.hourly_rate}/h = ${revenue:.2f}")